@@ -0,0 +1,50 @@
+"""Move transactions older than the horizon into per-user/per-year Parquet archives.
+
+    python archive_transactions.py [--months N] [--user ID] [--dry-run]
+
+N defaults to ARCHIVE_HORIZON_MONTHS and must cover the analytics window and the
+current budget periods, which are only ever read from the live table.
+"""
+import argparse
+
+from finance_tracker import create_app
+from finance_tracker.archive import archive_user, months_ago, users_to_archive
+from finance_tracker.extensions import db
+from finance_tracker.models import Transaction
+from finance_tracker.sharding import for_each_shard
+
+MIN_MONTHS = 7
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--months', type=int, help='archive transactions older than this many whole months')
+parser.add_argument('--user', type=int, help='archive a single user')
+parser.add_argument('--dry-run', action='store_true')
+args = parser.parse_args()
+
+app = create_app()
+
+with app.app_context():
+    months = args.months or app.config['ARCHIVE_HORIZON_MONTHS']
+    if months < MIN_MONTHS:
+        parser.error(f'--months must be at least {MIN_MONTHS}')
+    before = months_ago(months)
+
+    moved = 0
+    users = 0
+    for shard in for_each_shard():
+        user_ids = users_to_archive(before)
+        if args.user is not None:
+            user_ids = [user_id for user_id in user_ids if user_id == args.user]
+        for user_id in user_ids:
+            if args.dry_run:
+                count = db.session.query(Transaction).filter(
+                    Transaction.user_id == user_id, Transaction.date < before
+                ).count()
+                print(f"user {user_id} (shard {shard}): {count} transactions before {before:%Y-%m-%d}")
+            else:
+                count = archive_user(user_id, before)
+                print(f"user {user_id} (shard {shard}): archived {count} transactions")
+            moved += count
+            users += 1
+
+    print(f"{'Would archive' if args.dry_run else 'Archived'} {moved} transactions for {users} users")
@@ -0,0 +1,14 @@
+import sys
+
+from finance_tracker import create_app
+from finance_tracker.models import backfill_budget_snapshots
+from finance_tracker.sharding import for_each_shard
+
+app = create_app()
+
+with app.app_context():
+    periods = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    written = 0
+    for shard in for_each_shard():
+        written += backfill_budget_snapshots(periods)
+    print(f"Wrote {written} budget snapshots covering up to {periods} past periods per budget")
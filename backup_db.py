@@ -0,0 +1,46 @@
+"""Take an online snapshot of the central database, every shard and the transaction archive, or verify one.
+
+    python backup_db.py [--pages N]
+    python backup_db.py --list
+    python backup_db.py --verify NAME
+
+Writers keep running during the copy; snapshots go to BACKUP_DIR and only the
+newest BACKUP_KEEP are kept.
+"""
+import argparse
+import sys
+
+from finance_tracker import create_app
+from finance_tracker.backup import create_snapshot, list_snapshots, verify_snapshot
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--pages', type=int, help='pages copied per backup step (default BACKUP_PAGES_PER_STEP)')
+parser.add_argument('--list', action='store_true', help='list stored snapshots')
+parser.add_argument('--verify', metavar='NAME', help='verify a stored snapshot')
+args = parser.parse_args()
+
+app = create_app()
+
+with app.app_context():
+    if args.list:
+        for snapshot in list_snapshots():
+            stored = sum(entry['compressed_size'] for entry in snapshot['files'].values() if not entry['reused'])
+            print(f"{snapshot['name']}: {len(snapshot['files'])} files, {stored / 1024 / 1024:.1f} MiB new")
+        sys.exit(0)
+
+    if args.verify:
+        result = verify_snapshot(args.verify)
+        for problem in result['problems']:
+            print(problem)
+        print(f"{args.verify}: {'ok' if result['ok'] else 'FAILED'}")
+        sys.exit(0 if result['ok'] else 1)
+
+    manifest = create_snapshot(pages=args.pages)
+    for label, entry in manifest['files'].items():
+        action = 'unchanged, linked' if entry['reused'] else f"{entry['compressed_size'] / 1024 / 1024:.1f} MiB compressed"
+        print(f"{label}: {entry['size'] / 1024 / 1024:.1f} MiB, {sum(entry['row_counts'].values())} rows, "
+              f"{entry['restarts']} restarts, {action}")
+    archive = manifest['archive'].values()
+    print(f"archive: {len(archive)} files, {sum(entry['rows'] for entry in archive)} rows, "
+          f"{sum(1 for entry in archive if entry['reused'])} unchanged and linked")
+    print(f"Snapshot {manifest['name']} written in {manifest['seconds']:.1f}s")
@@ -0,0 +1,119 @@
+"""Writer commit latency while an online backup copies the database.
+
+Builds a transactions database of the given size, then runs a writer thread committing
+one transaction every couple of milliseconds (about what the app does per POST) through:
+
+  idle       no backup, for reference
+  blocking   rollback journal, whole file in one backup step
+  stepped    rollback journal, online_copy() in small steps that grow after each restart
+  wal        WAL mode (the app default), online_copy() under a read snapshot
+
+The request behind this was sized for a multi-GB database; the default here is 256 MiB
+so the run fits in a CI box. Pass 4096 for the full size; copy time grows linearly,
+the writer stalls of the blocking run grow with it and the WAL run stays flat.
+
+Usage: python benchmarks/bench_backup.py [size_mb] [pages_per_step]
+"""
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_tracker import create_app
+from finance_tracker.backup import online_copy
+from finance_tracker.extensions import db
+
+ROW = ('2025-01-01 12:00:00.000000', 'Groceries at the corner shop ' * 4, 42.5,
+       'expense', 'Food', 'Groceries', 1, 'notes ' * 20)
+INSERT = (
+    'INSERT INTO "transaction" (date, description, amount, category_type, category_group, category, user_id, notes) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+
+def build(path, size_mb):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path,
+        'RATELIMIT_ENABLED': False,
+        'SQLITE_WAL': False
+    })
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+    conn = sqlite3.connect(path)
+    while os.path.getsize(path) < size_mb * 1024 * 1024:
+        conn.executemany(INSERT, [ROW] * 50000)
+        conn.commit()
+    conn.close()
+
+def run(path, journal_mode, pages, backup):
+    conn = sqlite3.connect(path)
+    conn.execute(f'PRAGMA journal_mode={journal_mode}')
+    conn.close()
+
+    latencies = []
+    done = threading.Event()
+
+    def writer():
+        conn = sqlite3.connect(path, timeout=60)
+        while not done.is_set():
+            started = time.perf_counter()
+            conn.execute(INSERT, ROW)
+            conn.commit()
+            latencies.append(time.perf_counter() - started)
+            time.sleep(0.002)
+        conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    time.sleep(0.5)
+    latencies.clear()
+
+    target = path + '.copy'
+    started = time.perf_counter()
+    restarts = '-'
+    if backup is None:
+        time.sleep(2)
+    elif backup == 'blocking':
+        source, copy = sqlite3.connect(path, timeout=60), sqlite3.connect(target)
+        source.backup(copy)
+        copy.close()
+        source.close()
+    else:
+        restarts = online_copy(path, target, pages=pages)
+    elapsed = time.perf_counter() - started
+    done.set()
+    thread.join()
+    if os.path.exists(target):
+        os.remove(target)
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+    return elapsed, restarts, len(latencies), pick(0.5), pick(0.99), latencies[-1] * 1000
+
+
+if __name__ == '__main__':
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'bench.db')
+        build(path, size_mb)
+        print(f"{os.path.getsize(path) / 1024 / 1024:.0f} MiB database, {pages} pages per step")
+        print(f"{'run':<10} {'copy s':>7} {'restarts':>8} {'writes':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name, journal_mode, backup in [
+            ('idle', 'delete', None),
+            ('blocking', 'delete', 'blocking'),
+            ('stepped', 'delete', 'stepped'),
+            ('wal', 'wal', 'online')
+        ]:
+            elapsed, restarts, writes, p50, p99, worst = run(path, journal_mode, pages, backup)
+            print(f"{name:<10} {elapsed:>7.2f} {restarts:>8} {writes:>7} {p50:>8.2f} {p99:>8.2f} {worst:>8.1f}")
+    finally:
+        shutil.rmtree(directory)
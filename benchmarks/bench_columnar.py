@@ -0,0 +1,132 @@
+"""Analytics and budget usage answered from SQLite vs the in-memory columnar cache.
+
+Checks that both paths agree (after a fresh load and after POST/PUT/DELETE/import
+writes), then times each.
+
+Usage: python benchmarks/bench_columnar.py [rows]
+"""
+import io
+import os
+import sys
+import math
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_tracker import create_app
+from finance_tracker.extensions import db
+from finance_tracker.models import Budget, User, Transaction
+
+CATEGORIES = [
+    ('income', 'Employment', 'Salary'),
+    ('expense', 'Living Expenses', 'Groceries'),
+    ('expense', 'Living Expenses', 'Rent/Mortgage'),
+    ('expense', 'Lifestyle', 'Shopping'),
+    ('expense', 'Lifestyle', 'Dining Out')
+]
+
+
+def seed(rows):
+    user = User(username='bench', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    now = datetime.now()
+    transactions = []
+    for i in range(rows):
+        category_type, group, category = random.choice(CATEGORIES)
+        amount = round(random.uniform(1, 500), 2)
+        transactions.append({
+            'date': now - timedelta(minutes=random.randint(0, 60 * 24 * 240)),
+            'description': f'Transaction {i}',
+            'amount': amount if category_type == 'income' else -amount,
+            'category_type': category_type,
+            'category_group': group,
+            'category': category,
+            'notes': '',
+            'is_recurring': False,
+            'user_id': user.id
+        })
+    db.session.execute(Transaction.__table__.insert(), transactions)
+    db.session.add(Budget(user_id=user.id, category_group='Lifestyle', category='Shopping', monthly_limit=1000))
+    db.session.commit()
+    return user.id
+
+
+def close(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(close(a[k], b[k]) for k in a)
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+
+
+def both_paths(app, client):
+    cache = app.extensions.pop('columnar_cache')
+    try:
+        sql = client.get('/api/analytics').get_json()
+        sql_usage = [b['spent'] for b in client.get('/api/budget-status').get_json()['budgets']]
+    finally:
+        app.extensions['columnar_cache'] = cache
+    cached = client.get('/api/analytics').get_json()
+    cached_usage = [b['spent'] for b in client.get('/api/budget-status').get_json()['budgets']]
+    for payload in (sql, cached):
+        payload.pop('last_updated')
+    return sql, cached, sql_usage, cached_usage
+
+
+def check(label, app, client):
+    sql, cached, sql_usage, cached_usage = both_paths(app, client)
+    ok = close(sql, cached) and all(close(a, b) for a, b in zip(sql_usage, cached_usage))
+    print(f'parity {label}: {"ok" if ok else "MISMATCH"}')
+    return ok
+
+
+def measure(app, client, enabled, repeat=20):
+    cache = app.extensions.pop('columnar_cache')
+    if enabled:
+        app.extensions['columnar_cache'] = cache
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            client.get('/api/analytics')
+            best = min(best, time.perf_counter() - started)
+        return best * 1000
+    finally:
+        app.extensions['columnar_cache'] = cache
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'COLUMNAR_CACHE': True, 'RATELIMIT_ENABLED': False})
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        user_id = seed(rows)
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+
+    ok = check('after load', app, client)
+
+    created = client.post('/api/transactions', json={
+        'description': 'Bench purchase', 'amount': 42.5, 'category_type': 'expense',
+        'category_group': 'Lifestyle', 'category': 'Shopping'
+    }).get_json()['id']
+    client.put('/api/transactions', json={'id': created, 'amount': 99.0, 'category': 'Dining Out'})
+    with app.app_context():
+        victim = db.session.query(Transaction.id).filter(Transaction.category == 'Shopping').first()[0]
+    client.delete(f'/api/transactions?id={victim}')
+    client.post('/api/import', data={'file': (io.BytesIO(
+        b'date,description,amount,category_type,category_group,category\n'
+        + datetime.now().strftime('%Y-%m-%d').encode() + b',Imported,-12.34,expense,Lifestyle,Shopping\n'
+    ), 'import.csv')})
+    ok = check('after writes', app, client) and ok
+
+    sql_ms = measure(app, client, enabled=False)
+    cached_ms = measure(app, client, enabled=True)
+    with app.app_context():
+        print(app.extensions['columnar_cache'].stats())
+    print(f'rows={rows}')
+    print(f'/api/analytics via sqlite:   {sql_ms:.2f} ms')
+    print(f'/api/analytics via columnar: {cached_ms:.2f} ms ({sql_ms / cached_ms:.1f}x)')
+    sys.exit(0 if ok else 1)
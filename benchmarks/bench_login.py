@@ -0,0 +1,90 @@
+"""Login throughput and API latency while logins and API calls run side by side.
+
+Runs the same load twice: hashing inline on the request threads
+(PASSWORD_HASH_WORKERS=0), then in the worker process pool.
+
+Usage: python benchmarks/bench_login.py [seconds] [login_threads] [api_threads] [hash_workers]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_tracker import create_app
+from finance_tracker.extensions import db
+from finance_tracker.models import User
+
+
+def run(seconds, login_threads, api_threads, workers):
+    directory = tempfile.mkdtemp()
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, 'bench.db'),
+        'RATELIMIT_ENABLED': False,
+        'PASSWORD_HASH_WORKERS': workers
+    })
+    hasher = app.extensions['password_hasher']
+    try:
+        with app.app_context():
+            db.create_all()
+            for i in range(login_threads):
+                db.session.add(User(username=f'login{i}', password_hash=hasher.hash('secret')))
+            api_user = User(username='api', password_hash='x')
+            db.session.add(api_user)
+            db.session.commit()
+            api_user_id = api_user.id
+            hasher.needs_rehash('')  # resolve the configured method before timing
+
+        stop = time.perf_counter() + seconds
+        logins = []
+        latencies = []
+
+        def login(i):
+            client = app.test_client()
+            while time.perf_counter() < stop:
+                response = client.post('/login', data={'username': f'login{i}', 'password': 'secret'})
+                assert response.status_code == 302, response.status_code
+                logins.append(1)
+
+        def api():
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['user_id'] = api_user_id
+            while time.perf_counter() < stop:
+                started = time.perf_counter()
+                client.get('/api/categories')
+                latencies.append(time.perf_counter() - started)
+
+        threads = [threading.Thread(target=login, args=(i,)) for i in range(login_threads)]
+        threads += [threading.Thread(target=api) for _ in range(api_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        return {
+            'logins_per_s': len(logins) / seconds,
+            'api_per_s': len(latencies) / seconds,
+            'api_p50_ms': statistics.median(latencies) * 1000,
+            'api_p95_ms': latencies[int(len(latencies) * 0.95)] * 1000
+        }
+    finally:
+        hasher.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    login_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    api_threads = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else os.cpu_count()
+    print(f'cpus={os.cpu_count()} login_threads={login_threads} api_threads={api_threads} seconds={seconds}')
+    for label, pool in (('inline', 0), (f'pool({workers})', workers)):
+        result = run(seconds, login_threads, api_threads, pool)
+        print(f'{label:>8}: {result["logins_per_s"]:6.1f} logins/s  {result["api_per_s"]:7.1f} api/s  '
+              f'api p50 {result["api_p50_ms"]:.2f} ms  p95 {result["api_p95_ms"]:.2f} ms')
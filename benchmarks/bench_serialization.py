@@ -0,0 +1,83 @@
+"""Per-row serialization cost of the transaction list: ORM hydration vs column specs.
+
+Usage: python benchmarks/bench_serialization.py [rows]
+"""
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify
+
+from finance_tracker import create_app
+from finance_tracker.extensions import db
+from finance_tracker.models import User, Transaction
+from finance_tracker.serialization import TRANSACTION_FIELDS, fetch_rows, serialize_rows, json_response
+
+
+def legacy_list(user_id):
+    """The pre-column-spec implementation of GET /api/transactions"""
+    transactions = Transaction.query.filter_by(user_id=user_id).order_by(Transaction.date.desc()).all()
+    return jsonify([{
+        'id': t.id,
+        'date': t.date.strftime('%Y-%m-%d'),
+        'description': t.description,
+        'amount': t.amount,
+        'category_type': t.category_type,
+        'category_group': t.category_group,
+        'category': t.category,
+        'notes': t.notes,
+        'is_recurring': t.is_recurring,
+        'recurring_frequency': t.recurring_frequency
+    } for t in transactions])
+
+
+def fast_list(user_id):
+    rows = fetch_rows(TRANSACTION_FIELDS, Transaction.user_id == user_id, order_by=Transaction.date.desc())
+    return json_response(serialize_rows(TRANSACTION_FIELDS, rows))
+
+
+def seed(rows):
+    user = User(username='bench', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    start = datetime(2020, 1, 1)
+    db.session.execute(Transaction.__table__.insert(), [{
+        'date': start + timedelta(hours=i),
+        'description': f'Transaction {i}',
+        'amount': round(random.uniform(1, 500), 2),
+        'category_type': 'expense',
+        'category_group': 'Lifestyle',
+        'category': 'Shopping',
+        'notes': '',
+        'is_recurring': False,
+        'user_id': user.id
+    } for i in range(rows)])
+    db.session.commit()
+    return user.id
+
+
+def measure(fn, user_id, rows, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn(user_id).get_data()
+        best = min(best, time.perf_counter() - started)
+    return best / rows * 1e6
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    with app.app_context(), app.test_request_context():
+        db.create_all()
+        user_id = seed(rows)
+        before = measure(legacy_list, user_id, rows)
+        after = measure(fast_list, user_id, rows)
+    print(f'rows={rows}')
+    print(f'orm + strftime + jsonify: {before:.2f} us/row')
+    print(f'column spec + orjson:     {after:.2f} us/row ({before / after:.1f}x)')
@@ -0,0 +1,95 @@
+"""Concurrent write throughput against 1, 2, 4 and 8 shards.
+
+Each writer process owns one user and POSTs transactions through the app; users
+are spread round-robin over the shards, so with more shards fewer writers queue
+on the same SQLite write lock. Scaling needs as many cores as writers; on a
+single core the run is CPU-bound and stays flat.
+
+Usage: python benchmarks/bench_sharding.py [writers] [writes_per_writer]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_tracker import create_app
+from finance_tracker.extensions import db
+from finance_tracker.models import User, UserShard
+
+
+def config(directory, shards):
+    return {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, 'central.db'),
+        'SQLALCHEMY_ENGINE_OPTIONS': {'connect_args': {'timeout': 60}},
+        'SHARD_COUNT': shards,
+        'RATELIMIT_ENABLED': False,
+        'SHARD_URI_TEMPLATE': 'sqlite:///' + os.path.join(directory, 'shard_{shard}.db')
+    }
+
+
+def writer(directory, shards, user_id, writes, start):
+    app = create_app(config(directory, shards))
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    start.wait()
+    for i in range(writes):
+        response = client.post('/api/transactions', json={
+            'description': f'bench {user_id} {i}',
+            'amount': 10 + i,
+            'category_type': 'expense',
+            'category_group': 'Lifestyle',
+            'category': 'Shopping'
+        })
+        assert response.status_code == 200, response.get_json()
+
+
+def run(shards, writers, writes):
+    directory = tempfile.mkdtemp()
+    try:
+        app = create_app(config(directory, shards))
+        with app.app_context():
+            db.create_all()
+            router = app.extensions['shard_router']
+            for user_id in range(1, writers + 1):
+                db.session.add(User(id=user_id, username=f'bench{user_id}', password_hash='x'))
+                db.session.add(UserShard(user_id=user_id, shard=(user_id - 1) % shards))
+            db.session.commit()
+            for shard in range(1, shards):
+                router.engine(shard)
+
+        start = multiprocessing.Barrier(writers + 1)
+        processes = [
+            multiprocessing.Process(target=writer, args=(directory, shards, user_id, writes, start))
+            for user_id in range(1, writers + 1)
+        ]
+        for process in processes:
+            process.start()
+        start.wait()
+        started = time.perf_counter()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+        if any(process.exitcode for process in processes):
+            raise SystemExit('a writer failed')
+        return writers * writes / elapsed
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull  # the transaction route logs every request
+        writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+        writes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        results = [(shards, run(shards, writers, writes)) for shards in (1, 2, 4, 8)]
+        sys.stdout = sys.__stdout__
+
+    baseline = results[0][1]
+    print(f'{writers} writers x {writes} writes on {os.cpu_count()} CPU(s)')
+    for shards, throughput in results:
+        print(f'{shards} shard(s): {throughput:8.1f} writes/s ({throughput / baseline:.2f}x)')
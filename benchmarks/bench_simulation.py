@@ -0,0 +1,94 @@
+"""Savings goal simulation: the vectorized paths alone, the uncached endpoint and a cached hit.
+
+Seeds two years of monthly income, spending and goal contributions for five goals,
+checks that a fixed seed gives identical results, then times each.
+
+Usage: python benchmarks/bench_simulation.py [paths]
+"""
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_tracker import create_app
+from finance_tracker.extensions import db
+from finance_tracker.models import SavingsGoal, Transaction, User
+from finance_tracker.simulation import monthly_history, simulate
+
+
+def seed():
+    user = User(username='bench', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    now = datetime.now()
+    goals = [
+        SavingsGoal(
+            name=f'Goal {i}', target_amount=2000 * (i + 1), current_amount=300 * i,
+            target_date=now + timedelta(days=120 * (i + 1)), category='Savings',
+            priority=i + 1, user_id=user.id
+        ) for i in range(5)
+    ]
+    db.session.add_all(goals)
+    db.session.commit()
+
+    transactions = []
+    for month in range(24):
+        day = now - timedelta(days=30 * month + 5)
+        transactions.append(dict(
+            date=day, description='Salary', amount=random.uniform(5000, 6000), category_type='income',
+            category_group='Employment', category='Salary', user_id=user.id
+        ))
+        for _ in range(40):
+            transactions.append(dict(
+                date=day - timedelta(days=random.randint(0, 25)), description='Spend',
+                amount=random.uniform(5, 150), category_type='expense',
+                category_group='Living Expenses', category='Groceries', user_id=user.id
+            ))
+        for goal in goals[:3]:
+            transactions.append(dict(
+                date=day, description='To savings', amount=random.uniform(0, 400), category_type='expense',
+                category_group='Savings', category='Savings', user_id=user.id, savings_goal_id=goal.id
+            ))
+    db.session.execute(Transaction.__table__.insert(), transactions)
+    db.session.commit()
+    return user.id
+
+def best_of(fn, repeat=10):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+if __name__ == '__main__':
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'RATELIMIT_ENABLED': False})
+    with app.app_context():
+        db.create_all()
+        user_id = seed()
+        goals = SavingsGoal.query.filter_by(user_id=user_id).order_by(SavingsGoal.id).all()
+        months, net, contributions = monthly_history(user_id, [goal.id for goal in goals])
+        simulate(goals, net, contributions, paths, 0)  # numpy import
+
+        first, _ = simulate(goals, net, contributions, paths, 42)
+        second, _ = simulate(goals, net, contributions, paths, 42)
+        print(f"same seed, same result: {'ok' if first == second else 'MISMATCH'}")
+        for goal in first:
+            print(f"  {goal['name']}: p={goal['probability']:.2f} median={goal['completion'] and goal['completion']['p50']}")
+        print(f"{len(months)} history months, {len(goals)} goals, {paths} paths")
+        print(f"simulate():          {best_of(lambda: simulate(goals, net, contributions, paths, 0)):.2f} ms")
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    seeds = iter(range(1, 1000))
+    uncached = best_of(lambda: client.get(f'/api/savings-goals/simulation?paths={paths}&seed={next(seeds)}'))
+    print(f"endpoint, uncached:  {uncached:.2f} ms")
+    client.get(f'/api/savings-goals/simulation?paths={paths}&seed=0')
+    cached = best_of(lambda: client.get(f'/api/savings-goals/simulation?paths={paths}&seed=0'))
+    print(f"endpoint, cached:    {cached:.2f} ms")
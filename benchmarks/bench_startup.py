@@ -0,0 +1,80 @@
+"""Startup budget: module import time and cold first-request latency.
+
+Each measurement runs in a fresh interpreter so nothing is cached between runs.
+Exits non-zero when a median exceeds its threshold, so it can gate CI.
+
+Usage: python benchmarks/bench_startup.py [--max-import-ms N] [--max-first-request-ms N]
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_REQUEST = """
+import time
+started = time.perf_counter()
+from app import app
+client = app.test_client()
+response = client.get('/login')
+assert response.status_code == 200, response.status_code
+print(time.perf_counter() - started)
+"""
+
+
+def import_time():
+    """Cumulative import time of `app` in microseconds, plus the heaviest packages it pulls in"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line)
+        if match:
+            entries.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+    total = next(cumulative for cumulative, _, name in entries if name == 'app')
+    packages = sorted(
+        (e for e in entries if '.' not in e[2] and not e[2].startswith('_') and e[2] != 'app'),
+        reverse=True
+    )[:8]
+    return total, packages
+
+
+def first_request():
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env=dict(os.environ, DATABASE_URL='sqlite://')
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float, default=600)
+    parser.add_argument('--max-first-request-ms', type=float, default=900)
+    args = parser.parse_args()
+
+    imports = [import_time() for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _ in imports) / 1000
+    first_request_ms = statistics.median(first_request() for _ in range(args.runs)) * 1000
+
+    print('heaviest packages (last run):')
+    for cumulative, _, name in imports[-1][1]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+    print(f'import app:          {import_ms:8.1f} ms (budget {args.max_import_ms:.0f} ms)')
+    print(f'cold first request:  {first_request_ms:8.1f} ms (budget {args.max_first_request_ms:.0f} ms)')
+
+    failed = import_ms > args.max_import_ms or first_request_ms > args.max_first_request_ms
+    if failed:
+        print('startup budget exceeded')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
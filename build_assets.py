@@ -0,0 +1,13 @@
+"""Minify, fingerprint and precompress static assets into static/dist/.
+
+Run as part of each deploy; templates pick the hashed files up through asset_url().
+Usage: python build_assets.py
+"""
+import os
+
+from finance_tracker import PROJECT_ROOT
+from finance_tracker.assets import build
+
+if __name__ == '__main__':
+    manifest = build(os.path.join(PROJECT_ROOT, 'static'))
+    print(f"Built {len(manifest)} assets")
@@ -0,0 +1,83 @@
+import os
+
+from flask import Flask
+
+from .assets import init_assets
+from .backup import BackupRunner
+from .extensions import db
+from .passwords import LoginCache, PasswordHasher
+from .ratelimit import RateLimiter
+from .sharding import ShardRouter, enable_wal
+from .utils import VersionedCache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_app(config=None):
+    """Build the Flask app; heavy optional libraries are imported by the code paths that use them"""
+    app = Flask(
+        __name__,
+        root_path=PROJECT_ROOT,
+        template_folder='templates',
+        static_folder='static'
+    )
+    app.config['SECRET_KEY'] = 'your-secret-key'
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///finance_tracker.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SHARD_COUNT'] = int(os.environ.get('SHARD_COUNT', 1))
+    app.config['SHARD_URI_TEMPLATE'] = os.environ.get('SHARD_URI_TEMPLATE')
+    # WAL lets writers continue while reports, jobs and backups read
+    app.config['SQLITE_WAL'] = os.environ.get('SQLITE_WAL', '1') == '1'
+    # Optional per-process columnar copy of hot users' transactions (needs numpy)
+    app.config['COLUMNAR_CACHE'] = os.environ.get('COLUMNAR_CACHE', '') == '1'
+    app.config['COLUMNAR_CACHE_MAX_BYTES'] = int(os.environ.get('COLUMNAR_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', '1') == '1'
+    # Token buckets kept per worker; refilled ones are dropped once there are more than this
+    app.config['RATELIMIT_MAX_KEYS'] = int(os.environ.get('RATELIMIT_MAX_KEYS', 50000))
+    # Password hashing cost; stored hashes made with other parameters are upgraded at login
+    app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    app.config['PASSWORD_SALT_LENGTH'] = 16
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    app.config['PASSWORD_HASH_TIMEOUT'] = 10
+    app.config['LOGIN_CACHE_SIZE'] = 1024
+    app.config['LOGIN_CACHE_TTL'] = 300
+    app.config['REPORT_CACHE_SIZE'] = 256
+    # Savings goal simulation: months of cash flow resampled, and how far ahead paths run
+    app.config['SIMULATION_HISTORY_MONTHS'] = 12
+    app.config['SIMULATION_MAX_MONTHS'] = 120
+    app.config['SIMULATION_MAX_PATHS'] = 100000
+    # goals x paths x months held in memory at once (float32 running totals, ~16 MiB)
+    app.config['SIMULATION_MAX_CELLS'] = 4 * 1024 * 1024
+    app.config['SIMULATION_CACHE_SIZE'] = 256
+    # Transactions older than the horizon are moved to per-user Parquet files by archive_transactions.py
+    app.config['ARCHIVE_DIR'] = os.environ.get('ARCHIVE_DIR') or os.path.join(app.instance_path, 'archive')
+    app.config['ARCHIVE_HORIZON_MONTHS'] = int(os.environ.get('ARCHIVE_HORIZON_MONTHS', 24))
+    # Online snapshots of every database file, written by backup_db.py or POST /api/admin/backups
+    app.config['BACKUP_DIR'] = os.environ.get('BACKUP_DIR') or os.path.join(app.instance_path, 'backups')
+    app.config['BACKUP_KEEP'] = int(os.environ.get('BACKUP_KEEP', 7))
+    app.config['BACKUP_PAGES_PER_STEP'] = int(os.environ.get('BACKUP_PAGES_PER_STEP', 256))
+    app.config['ADMIN_USERNAMES'] = [name for name in os.environ.get('ADMIN_USERNAMES', '').split(',') if name]
+    if config:
+        app.config.update(config)
+
+    db.init_app(app)
+    init_assets(app)
+    app.extensions['shard_router'] = ShardRouter(app, db)
+    if app.config['SQLITE_WAL']:
+        with app.app_context():
+            enable_wal(db.engine)
+    app.extensions['rate_limiter'] = RateLimiter(app, app.config.get('RATELIMIT_BACKEND'))
+    app.extensions['password_hasher'] = PasswordHasher(app)
+    app.extensions['login_cache'] = LoginCache(app.config['LOGIN_CACHE_SIZE'], app.config['LOGIN_CACHE_TTL'])
+    app.extensions['report_cache'] = VersionedCache(app.config['REPORT_CACHE_SIZE'])
+    app.extensions['simulation_cache'] = VersionedCache(app.config['SIMULATION_CACHE_SIZE'])
+    app.extensions['backup_runner'] = BackupRunner(app)
+    if app.config['COLUMNAR_CACHE']:
+        from .columnar import ColumnarCache
+        app.extensions['columnar_cache'] = ColumnarCache(app.config['COLUMNAR_CACHE_MAX_BYTES'])
+
+    from .blueprints import BLUEPRINTS
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+
+    return app
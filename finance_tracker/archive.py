@@ -0,0 +1,247 @@
+import os
+from datetime import date, datetime
+
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from .balances import refresh_balance_checkpoints
+from .changes import record_change
+from .extensions import db
+from .models import ArchiveState, ArchiveSummary, Budget, Transaction
+
+# Everything needed to export, search or re-import an archived transaction
+ARCHIVE_COLUMNS = [
+    'id', 'date', 'description', 'amount', 'category_type', 'category_group', 'category',
+    'notes', 'is_recurring', 'recurring_frequency', 'savings_goal_id', 'fingerprint', 'created_at'
+]
+
+
+def _pyarrow():
+    # Only the archival job and queries that reach archived ranges need pyarrow
+    import pyarrow
+    import pyarrow.parquet
+    return pyarrow
+
+def _schema(pa):
+    return pa.schema([
+        ('id', pa.int64()),
+        ('date', pa.timestamp('us')),
+        ('description', pa.string()),
+        ('amount', pa.float64()),
+        ('category_type', pa.string()),
+        ('category_group', pa.string()),
+        ('category', pa.string()),
+        ('notes', pa.string()),
+        ('is_recurring', pa.bool_()),
+        ('recurring_frequency', pa.string()),
+        ('savings_goal_id', pa.int64()),
+        ('fingerprint', pa.string()),
+        ('created_at', pa.timestamp('us'))
+    ])
+
+def archive_files():
+    """Path of every archive file relative to ARCHIVE_DIR, as <user_id>/<year>.parquet"""
+    root = current_app.config['ARCHIVE_DIR']
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        os.path.join(user, name)
+        for user in os.listdir(root) if os.path.isdir(os.path.join(root, user))
+        for name in os.listdir(os.path.join(root, user)) if name.endswith('.parquet')
+    )
+
+def file_row_count(path):
+    return _pyarrow().parquet.ParquetFile(path).metadata.num_rows
+
+def archive_path(user_id, year):
+    # Keyed by user rather than shard, so rebalancing never has to move files
+    return os.path.join(current_app.config['ARCHIVE_DIR'], str(user_id), f'{year}.parquet')
+
+def months_ago(months, now=None):
+    """Midnight on the first of the month `months` before now; archival works in whole months"""
+    now = now or datetime.now()
+    index = now.year * 12 + now.month - 1 - months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def archived_before(user_id):
+    return db.session.query(ArchiveState.archived_before).filter(
+        ArchiveState.user_id == user_id
+    ).scalar()
+
+def reaches_archive(user_id, start):
+    """The user's archive horizon if a range starting at `start` (None = open) reaches into it"""
+    horizon = archived_before(user_id)
+    if horizon is None or (start is not None and start >= horizon):
+        return None
+    return horizon
+
+def archived_rows(user_id, start=None, end=None):
+    """Archived transactions with start <= date < end, as dicts keyed by ARCHIVE_COLUMNS"""
+    horizon = archived_before(user_id)
+    if horizon is None or (start is not None and start >= horizon):
+        return []
+
+    directory = os.path.join(current_app.config['ARCHIVE_DIR'], str(user_id))
+    if not os.path.isdir(directory):
+        return []
+    years = sorted(int(name.split('.')[0]) for name in os.listdir(directory) if name.endswith('.parquet'))
+    years = [
+        year for year in years
+        if (start is None or year >= start.year) and (end is None or year <= end.year)
+    ]
+    if not years:
+        return []
+
+    pa = _pyarrow()
+    filters = []
+    if start is not None:
+        filters.append(('date', '>=', start))
+    if end is not None:
+        filters.append(('date', '<', end))
+    rows = []
+    for year in years:
+        table = pa.parquet.read_table(archive_path(user_id, year), filters=filters or None)
+        rows.extend(table.to_pylist())
+    return rows
+
+def archived_fingerprints(user_id, start, end):
+    return {row['fingerprint'] for row in archived_rows(user_id, start, end) if row['fingerprint']}
+
+def archived_daily_net(user_id, start=None):
+    """Income minus expenses per archived day on or after start, for rebuilding balance checkpoints"""
+    daily = {}
+    for row in archived_rows(user_id, start):
+        day = row['date'].date()
+        net = row['amount'] if row['category_type'] == 'income' else -abs(row['amount'])
+        daily[day] = daily.get(day, 0) + net
+    return daily
+
+
+def _archive_key(transaction_id, created_at):
+    # Ids alone are reused: SQLite hands out a deleted max rowid again and rebalancing renumbers rows
+    return transaction_id, created_at
+
+def _replace_file(pa, path, table):
+    tmp = path + '.tmp'
+    pa.parquet.write_table(table, tmp, compression='zstd')
+    os.replace(tmp, path)
+
+def _write_year(pa, user_id, year, rows):
+    """Merge rows into the year's file; rows already archived by an interrupted run are replaced"""
+    path = archive_path(user_id, year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pylist(rows, schema=_schema(pa))
+    if os.path.exists(path):
+        existing = pa.parquet.read_table(path, schema=_schema(pa))
+        keys = {_archive_key(row['id'], row['created_at']) for row in rows}
+        keep = [
+            i for i, key in enumerate(zip(existing.column('id').to_pylist(), existing.column('created_at').to_pylist()))
+            if _archive_key(*key) not in keys
+        ]
+        table = pa.concat_tables([existing.take(keep), table])
+    _replace_file(pa, path, table.sort_by('date'))
+
+def remap_archive(user_id, transaction_ids, goal_ids):
+    """Apply a rebalance's id renumbering to the user's archive files.
+
+    Rows left live by an interrupted archive run take their new ids, so re-running still
+    replaces them; goal links follow the renumbered goals.
+    """
+    directory = os.path.join(current_app.config['ARCHIVE_DIR'], str(user_id))
+    if not os.path.isdir(directory):
+        return
+    pa = _pyarrow()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.parquet'):
+            continue
+        path = os.path.join(directory, name)
+        table = pa.parquet.read_table(path, schema=_schema(pa))
+        ids = [transaction_ids.get(value, value) for value in table.column('id').to_pylist()]
+        goals = [
+            goal_ids.get(value) if value is not None else None
+            for value in table.column('savings_goal_id').to_pylist()
+        ]
+        table = table.set_column(table.schema.get_field_index('id'), 'id', pa.array(ids, pa.int64()))
+        table = table.set_column(
+            table.schema.get_field_index('savings_goal_id'), 'savings_goal_id', pa.array(goals, pa.int64())
+        )
+        _replace_file(pa, path, table)
+
+def archive_user(user_id, before):
+    """Move the user's transactions dated before `before` into their archive; returns rows moved.
+
+    Files are written first and are idempotent per transaction id; summaries, the horizon
+    and the delete then commit together, so a crash in between is repaired by re-running.
+    """
+    columns = [getattr(Transaction, name) for name in ARCHIVE_COLUMNS]
+    rows = [
+        dict(zip(ARCHIVE_COLUMNS, row)) for row in db.session.execute(
+            select(*columns).where(Transaction.user_id == user_id, Transaction.date < before)
+        )
+    ]
+    if not rows:
+        return 0
+
+    # Checkpoints and budget snapshots must cover the archived days before the rows behind them disappear
+    refresh_balance_checkpoints(user_id)
+    for budget in Budget.query.filter_by(user_id=user_id):
+        budget.close_elapsed_periods()
+
+    pa = _pyarrow()
+    by_year = {}
+    for row in rows:
+        row['is_recurring'] = bool(row['is_recurring'])
+        by_year.setdefault(row['date'].year, []).append(row)
+    for year, year_rows in sorted(by_year.items()):
+        _write_year(pa, user_id, year, year_rows)
+
+    month = func.strftime('%Y-%m-01', Transaction.date)
+    is_recurring = func.coalesce(Transaction.is_recurring, False)
+    summaries = db.session.execute(select(
+        month, Transaction.category_type, Transaction.category_group, Transaction.category, is_recurring,
+        func.count(), func.sum(Transaction.amount), func.min(Transaction.amount), func.max(Transaction.amount)
+    ).where(
+        Transaction.user_id == user_id, Transaction.date < before
+    ).group_by(
+        month, Transaction.category_type, Transaction.category_group, Transaction.category, is_recurring
+    )).all()
+
+    table = ArchiveSummary.__table__
+    for first, category_type, category_group, category, recurring, count, total, low, high in summaries:
+        statement = insert(table).values(
+            user_id=user_id, month=date.fromisoformat(first), category_type=category_type,
+            category_group=category_group, category=category, is_recurring=bool(recurring),
+            count=count, total=total, minimum=low, maximum=high
+        )
+        # Later runs can add rows (e.g. old imports) to a month that is already summarized
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=['user_id', 'month', 'category_type', 'category_group', 'category', 'is_recurring'],
+            set_={
+                'count': table.c.count + statement.excluded.count,
+                'total': table.c.total + statement.excluded.total,
+                'minimum': func.min(table.c.minimum, statement.excluded.minimum),
+                'maximum': func.max(table.c.maximum, statement.excluded.maximum)
+            }
+        ))
+
+    state = ArchiveState.query.filter_by(user_id=user_id).first()
+    if state is None:
+        state = ArchiveState(user_id=user_id, archived_before=before, archived_count=0)
+        db.session.add(state)
+    state.archived_before = max(state.archived_before, before)
+    state.archived_count += len(rows)
+
+    Transaction.query.filter(
+        Transaction.user_id == user_id, Transaction.date < before
+    ).delete(synchronize_session=False)
+    # Moves the data version so cached reports are recomputed; sync clients ignore the entity
+    record_change(user_id, 'archive', len(rows))
+    db.session.commit()
+    return len(rows)
+
+def users_to_archive(before):
+    return [user_id for user_id, in db.session.query(Transaction.user_id).filter(
+        Transaction.date < before
+    ).distinct()]
@@ -0,0 +1,122 @@
+import os
+import re
+import gzip
+import json
+import shutil
+import hashlib
+import mimetypes
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - .br variants are skipped
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # pragma: no cover - JS is shipped unminified, compression still applies
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:  # pragma: no cover - regex fallback below
+    rcssmin = None
+
+# Built assets: static/dist/<name>.<hash>.<ext> plus .gz/.br siblings and a manifest
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+SOURCE_EXTENSIONS = ('.js', '.css')
+SKIP_DIRS = {DIST_DIR, 'src'}  # src/ holds the tailwind input, not a served asset
+IMMUTABLE = 'public, max-age=31536000, immutable'
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def minify_css(text):
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    # ':' is left alone: '--tw-x: ;' needs its space and '.a :hover' differs from '.a:hover'
+    text = re.sub(r'(?<!:)\s*([{};,>])\s*', r'\1', text)
+    return text.replace(';}', '}').strip()
+
+def minify_js(text):
+    # No safe regex minifier for JS (template literals, regex literals), so only with rjsmin
+    return rjsmin.jsmin(text) if rjsmin is not None else text
+
+def build(static_folder):
+    """Minify, content-hash and precompress every JS/CSS file; returns the manifest"""
+    dist = os.path.join(static_folder, DIST_DIR)
+    shutil.rmtree(dist, ignore_errors=True)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for filename in sorted(files):
+            stem, ext = os.path.splitext(filename)
+            if ext not in SOURCE_EXTENSIONS:
+                continue
+            source = os.path.join(root, filename)
+            with open(source, encoding='utf-8') as f:
+                text = f.read()
+            data = (minify_css(text) if ext == '.css' else minify_js(text)).encode('utf-8')
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            relative = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            hashed = f'{DIST_DIR}/{os.path.dirname(relative)}/{stem}.{digest}{ext}'.replace('//', '/')
+            target = os.path.join(static_folder, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, 9, mtime=0))
+            if brotli is not None:
+                with open(target + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+
+            manifest[relative] = hashed
+            print(f"{relative}: {len(text.encode('utf-8'))} -> {len(data)} bytes as {hashed}")
+
+    with open(os.path.join(dist, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(app):
+    path = os.path.join(app.static_folder, DIST_DIR, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def asset_url(filename):
+    """URL of the built, fingerprinted copy of a static file (the source file in debug or before a build)"""
+    manifest = current_app.extensions['asset_manifest']
+    if current_app.debug or filename not in manifest:
+        return url_for('static', filename=filename)
+    return url_for('static', filename=manifest[filename])
+
+def serve_static(filename):
+    """Static view that serves precompressed variants of built assets with a year-long immutable cache"""
+    if not filename.startswith(DIST_DIR + '/'):
+        return current_app.send_static_file(filename)
+
+    mimetype = mimetypes.guess_type(filename)[0]
+    chosen, encoding = filename, None
+    for name, suffix in ENCODINGS:
+        if request.accept_encodings[name] and os.path.exists(os.path.join(current_app.static_folder, filename + suffix)):
+            chosen, encoding = filename + suffix, name
+            break
+
+    response = send_from_directory(current_app.static_folder, chosen, mimetype=mimetype, max_age=31536000)
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Cache-Control'] = IMMUTABLE
+    response.vary.add('Accept-Encoding')
+    return response
+
+def init_assets(app):
+    app.extensions['asset_manifest'] = load_manifest(app)
+    app.view_functions['static'] = serve_static
+    app.add_template_global(asset_url)
@@ -0,0 +1,280 @@
+import os
+import gzip
+import json
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+
+from flask import current_app
+
+from .archive import archive_files, file_row_count
+from .sharding import CENTRAL_TABLES, get_router
+
+MANIFEST = 'manifest.json'
+ARCHIVE = 'archive'  # snapshot subdirectory mirroring ARCHIVE_DIR
+CHUNK = 1024 * 1024
+
+
+def database_files():
+    """(label, path) of every SQLite file the app writes: the central database and each extra shard"""
+    router = get_router()
+    files = []
+    for shard in range(router.count):
+        path = router.engine(shard).url.database
+        if not path or path == ':memory:':
+            raise ValueError(f'Shard {shard} is not a file database and cannot be backed up')
+        files.append(('central' if shard == 0 else f'shard_{shard}', path))
+    return files
+
+def expected_tables(label):
+    router = get_router()
+    tables = [table.name for table in router.sharded_tables()]
+    return sorted(tables + list(CENTRAL_TABLES)) if label == 'central' else sorted(tables)
+
+
+class _Restarted(Exception):
+    pass
+
+def online_copy(source, target, pages=256, sleep=0.005):
+    """Copy a live database with SQLite's backup API without holding writers off for the whole copy.
+
+    A WAL source is copied in a single step: the step only holds a read snapshot, which
+    writers don't wait for. Otherwise the copy takes `pages` pages per step and writers
+    get the lock between steps; since a write from another connection restarts the copy
+    from the first page, each restart doubles the step size so a busy database still
+    finishes (at worst in one step). Returns the number of restarts.
+    """
+    restarts = 0
+    src = sqlite3.connect(source, timeout=30)
+    dst = sqlite3.connect(target)
+    try:
+        if src.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+            pages = -1
+        while True:
+            seen = []
+
+            def progress(status, remaining, total):
+                if seen and remaining > seen[-1]:
+                    raise _Restarted()
+                seen.append(remaining)
+
+            try:
+                src.backup(dst, pages=pages, progress=progress, sleep=sleep)
+                # A self-contained file, without -wal/-shm companions
+                dst.execute('PRAGMA journal_mode=DELETE')
+                return restarts
+            except _Restarted:
+                restarts += 1
+                pages = pages * 2 if 0 < pages < 1 << 20 else -1
+    finally:
+        dst.close()
+        src.close()
+
+
+def table_counts(path, tables):
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        if conn.execute('PRAGMA quick_check').fetchone()[0] != 'ok':
+            raise ValueError(f'{os.path.basename(path)} failed PRAGMA quick_check')
+        present = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables if table in present}
+    finally:
+        conn.close()
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _compress(path, target):
+    with open(path, 'rb') as src, gzip.open(target, 'wb', compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, CHUNK)
+
+def _decompress(path, target):
+    with gzip.open(path, 'rb') as src, open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, CHUNK)
+
+
+def _link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+def copy_archive(directory, previous):
+    """Copy the Parquet archive into the snapshot; archived transactions exist nowhere else.
+
+    Runs after the database copies: archival writes a file before deleting its rows, so
+    a run in between leaves rows in both copies (merged again on the next run), never in neither.
+    Files are stored as they are (Parquet is already compressed) and linked when unchanged.
+    """
+    root = current_app.config['ARCHIVE_DIR']
+    previous_files = previous.get('archive', {}) if previous else {}
+    entries = {}
+    for relative in archive_files():
+        stored = os.path.join(directory, ARCHIVE, relative)
+        os.makedirs(os.path.dirname(stored), exist_ok=True)
+        # Archive files are swapped in with os.replace, so a copy always sees a whole file
+        shutil.copyfile(os.path.join(root, relative), stored)
+        checksum = _sha256(stored)
+        reused = previous_files.get(relative, {}).get('sha256') == checksum
+        if reused:
+            os.remove(stored)
+            _link_or_copy(os.path.join(current_app.config['BACKUP_DIR'], previous['name'], ARCHIVE, relative), stored)
+        entries[relative] = {
+            'sha256': checksum,
+            'size': os.path.getsize(stored),
+            'reused': reused,
+            'rows': file_row_count(stored)
+        }
+    return entries
+
+
+def list_snapshots():
+    root = current_app.config['BACKUP_DIR']
+    if not os.path.isdir(root):
+        return []
+    snapshots = []
+    for name in sorted(os.listdir(root), reverse=True):
+        manifest = os.path.join(root, name, MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                snapshots.append(json.load(f))
+    return snapshots
+
+def create_snapshot(pages=None):
+    """Back up every database into BACKUP_DIR/<timestamp>/ as verified, gzipped copies,
+    plus the transaction archive under archive/.
+
+    Files whose content is unchanged since the newest snapshot are hard-linked instead of
+    stored again, and only the newest BACKUP_KEEP snapshots are kept.
+    """
+    root = current_app.config['BACKUP_DIR']
+    pages = pages or current_app.config['BACKUP_PAGES_PER_STEP']
+    name = datetime.utcnow().strftime('%Y%m%dT%H%M%S%fZ')
+    directory = os.path.join(root, name)
+    os.makedirs(directory)
+    previous = list_snapshots()
+    previous = previous[0] if previous else None
+    started = datetime.utcnow()
+
+    try:
+        manifest = {'name': name, 'created_at': started.isoformat(), 'files': {}}
+        for label, path in database_files():
+            with tempfile.TemporaryDirectory(dir=root) as scratch:
+                copy = os.path.join(scratch, f'{label}.db')
+                restarts = online_copy(path, copy, pages=pages)
+                counts = table_counts(copy, expected_tables(label))
+                checksum = _sha256(copy)
+
+                stored = os.path.join(directory, f'{label}.db.gz')
+                reused = previous is not None and previous['files'].get(label, {}).get('sha256') == checksum
+                if reused:
+                    _link_or_copy(os.path.join(root, previous['name'], f'{label}.db.gz'), stored)
+                else:
+                    _compress(copy, stored)
+
+                manifest['files'][label] = {
+                    'sha256': checksum,
+                    'size': os.path.getsize(copy),
+                    'compressed_size': os.path.getsize(stored),
+                    'reused': reused,
+                    'restarts': restarts,
+                    'row_counts': counts
+                }
+        manifest['archive'] = copy_archive(directory, previous)
+        manifest['seconds'] = (datetime.utcnow() - started).total_seconds()
+
+        # Written last and renamed into place: list_snapshots only sees complete snapshots
+        with open(os.path.join(directory, MANIFEST + '.tmp'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(os.path.join(directory, MANIFEST + '.tmp'), os.path.join(directory, MANIFEST))
+    except BaseException:
+        # Without a manifest rotate_snapshots would never see it, so a partial snapshot is removed here
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    rotate_snapshots()
+    return manifest
+
+def rotate_snapshots():
+    root = current_app.config['BACKUP_DIR']
+    for snapshot in list_snapshots()[current_app.config['BACKUP_KEEP']:]:
+        shutil.rmtree(os.path.join(root, snapshot['name']), ignore_errors=True)
+
+def verify_snapshot(name):
+    """Decompress each file of a snapshot and check its integrity, checksum and row counts per table,
+    then the checksum and row count of each archive file"""
+    root = current_app.config['BACKUP_DIR']
+    with open(os.path.join(root, name, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    problems = []
+    for label, entry in manifest['files'].items():
+        with tempfile.TemporaryDirectory(dir=root) as scratch:
+            copy = os.path.join(scratch, f'{label}.db')
+            _decompress(os.path.join(root, name, f'{label}.db.gz'), copy)
+            if _sha256(copy) != entry['sha256']:
+                problems.append(f'{label}: checksum mismatch')
+                continue
+            try:
+                counts = table_counts(copy, expected_tables(label))
+            except (ValueError, sqlite3.DatabaseError) as e:
+                problems.append(f'{label}: {e}')
+                continue
+            for table, count in entry['row_counts'].items():
+                if counts.get(table) != count:
+                    problems.append(f'{label}.{table}: {counts.get(table)} rows, manifest says {count}')
+
+    for relative, entry in manifest.get('archive', {}).items():
+        path = os.path.join(root, name, ARCHIVE, relative)
+        if not os.path.exists(path):
+            problems.append(f'{ARCHIVE}/{relative}: missing')
+            continue
+        if _sha256(path) != entry['sha256']:
+            problems.append(f'{ARCHIVE}/{relative}: checksum mismatch')
+            continue
+        try:
+            rows = file_row_count(path)
+        except (OSError, ValueError) as e:  # pyarrow's ArrowInvalid is a ValueError
+            problems.append(f'{ARCHIVE}/{relative}: {e}')
+            continue
+        if rows != entry['rows']:
+            problems.append(f'{ARCHIVE}/{relative}: {rows} rows, manifest says {entry["rows"]}')
+    return {'name': name, 'ok': not problems, 'problems': problems}
+
+
+class BackupRunner:
+    """Runs at most one snapshot at a time in a background thread, for the admin endpoint"""
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+        self.running = None
+        self.last_result = None
+
+    def start(self):
+        with self._lock:
+            if self.running is not None:
+                return False
+            self.running = datetime.utcnow().isoformat()
+        threading.Thread(target=self._run, daemon=True).start()
+        return True
+
+    def _run(self):
+        try:
+            with self.app.app_context():
+                manifest = create_snapshot()
+            self.last_result = {'ok': True, 'name': manifest['name'], 'seconds': manifest['seconds']}
+        except Exception as e:
+            print(f"Backup failed: {str(e)}")
+            self.last_result = {'ok': False, 'error': str(e)}
+        finally:
+            self.running = None
+
+    def status(self):
+        return {'running_since': self.running, 'last_result': self.last_result}
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from .changes import data_version
+from .extensions import db
+from .models import BalanceCheckpoint, Transaction
+
+def invalidate_balance_checkpoints(user_id, since):
+    """Drop checkpoints on or after the day of a changed transaction; earlier ones stay valid"""
+    since_day = since.date() if isinstance(since, datetime) else since
+    BalanceCheckpoint.query.filter(
+        BalanceCheckpoint.user_id == user_id,
+        BalanceCheckpoint.day >= since_day
+    ).delete(synchronize_session=False)
+
+def refresh_balance_checkpoints(user_id, attempts=3):
+    """Extend the user's checkpoints past the last valid one up to their latest transaction"""
+    from .archive import archived_daily_net, reaches_archive
+
+    # Every transaction write logs a change in the same commit as its invalidation
+    version = data_version(user_id)
+    last = BalanceCheckpoint.query.filter_by(user_id=user_id).order_by(
+        BalanceCheckpoint.day.desc()
+    ).first()
+    start = datetime.combine(last.day + timedelta(days=1), datetime.min.time()) if last else None
+    # A rebuild starting inside the archived range (from scratch, or after a backdated
+    # write invalidated archived days) has to replay the archived history as well
+    archived = archived_daily_net(user_id, start) if reaches_archive(user_id, start) else {}
+    latest = db.session.query(func.max(Transaction.date)).filter(
+        Transaction.user_id == user_id
+    ).scalar()
+    if not archived and (latest is None or (last and latest.date() <= last.day)):
+        return
+
+    criteria = [Transaction.user_id == user_id]
+    if start is not None:
+        criteria.append(Transaction.date >= start)
+    daily_net = db.session.query(
+        func.date(Transaction.date),
+        func.sum(db.case(
+            (Transaction.category_type == 'income', Transaction.amount),
+            else_=-func.abs(Transaction.amount)
+        ))
+    ).filter(*criteria).group_by(func.date(Transaction.date)).order_by(func.date(Transaction.date))
+
+    daily = {datetime.strptime(day, '%Y-%m-%d').date(): net for day, net in daily_net}
+    for day, net in archived.items():
+        daily[day] = daily.get(day, 0) + net
+
+    balance = last.balance if last else 0
+    checkpoints = []
+    for day in sorted(daily):
+        balance += daily[day]
+        checkpoints.append({
+            'user_id': user_id,
+            'day': day,
+            'balance': balance
+        })
+    if checkpoints:
+        try:
+            db.session.execute(BalanceCheckpoint.__table__.insert(), checkpoints)
+            # The insert holds the write lock, so a write this check doesn't see commits after us and
+            # invalidates what we wrote. One it does see may have deleted its checkpoints before
+            # this insert put back balances computed without it.
+            if data_version(user_id) != version:
+                db.session.rollback()
+                if attempts > 1:
+                    refresh_balance_checkpoints(user_id, attempts - 1)
+                return
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request built the same checkpoints first
+            db.session.rollback()
+
+def balances_at(user_id, days):
+    """Running balance at the end of each of the given ascending days, from the nearest checkpoint
+    at or before each; all checkpoints come from one ordered range query"""
+    if not days:
+        return []
+    # The range opens at the last checkpoint at or before the first day
+    floor = db.session.query(func.max(BalanceCheckpoint.day)).filter(
+        BalanceCheckpoint.user_id == user_id,
+        BalanceCheckpoint.day <= days[0]
+    ).scalar_subquery()
+    checkpoints = db.session.query(BalanceCheckpoint.day, BalanceCheckpoint.balance).filter(
+        BalanceCheckpoint.user_id == user_id,
+        BalanceCheckpoint.day >= func.coalesce(floor, days[0]),
+        BalanceCheckpoint.day <= days[-1]
+    ).order_by(BalanceCheckpoint.day).all()
+
+    balances = []
+    balance = 0
+    position = 0
+    for day in days:
+        while position < len(checkpoints) and checkpoints[position].day <= day:
+            balance = checkpoints[position].balance
+            position += 1
+        balances.append(balance or 0)
+    return balances
+
+def period_ends(start, end, granularity):
+    """Last day of every day/week/month period between start and end, clipped to end"""
+    points = []
+    current = start
+    while current <= end:
+        if granularity == 'day':
+            period_end = current
+        elif granularity == 'week':
+            period_end = current + timedelta(days=6 - current.weekday())  # weeks end on Sunday
+        else:
+            next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+            period_end = next_month - timedelta(days=1)
+        period_end = min(period_end, end)
+        points.append(period_end)
+        current = period_end + timedelta(days=1)
+    return points
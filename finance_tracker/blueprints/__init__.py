@@ -0,0 +1,13 @@
+from . import admin, analytics, auth, budgets, categories, export, goals, sync, transactions
+
+BLUEPRINTS = [
+    auth.bp,
+    categories.bp,
+    transactions.bp,
+    budgets.bp,
+    goals.bp,
+    analytics.bp,
+    export.bp,
+    sync.bp,
+    admin.bp
+]
@@ -0,0 +1,64 @@
+from flask import Blueprint, current_app, jsonify, session
+
+from ..backup import list_snapshots, verify_snapshot
+from ..ratelimit import rate_limited
+from ..utils import handle_errors
+
+bp = Blueprint('admin', __name__)
+
+def is_admin():
+    return session.get('username') in current_app.config['ADMIN_USERNAMES']
+
+@bp.route('/api/admin/rate-limits')
+@handle_errors
+def get_rate_limit_stats():
+    """Limiter counters for this worker, for tuning the limits against real load"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    return jsonify(current_app.extensions['rate_limiter'].stats())
+
+@bp.route('/api/admin/backups', methods=['GET'])
+@handle_errors
+def get_backups():
+    """Stored snapshots, newest first, and the state of this worker's backup job"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    return jsonify({
+        'snapshots': list_snapshots(),
+        'job': current_app.extensions['backup_runner'].status()
+    })
+
+@bp.route('/api/admin/backups', methods=['POST'])
+@handle_errors
+def start_backup():
+    """Start an online snapshot in the background; poll GET /api/admin/backups for the result"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    runner = current_app.extensions['backup_runner']
+    if not runner.start():
+        return jsonify({'error': 'A backup is already running', 'job': runner.status()}), 409
+    return jsonify({'message': 'Backup started', 'job': runner.status()}), 202
+
+@bp.route('/api/admin/backups/<name>/verify', methods=['POST'])
+@rate_limited('bulk')
+@handle_errors
+def verify_backup(name):
+    """Restore a snapshot to scratch files and check integrity and row counts against its manifest"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    if name not in {snapshot['name'] for snapshot in list_snapshots()}:
+        return jsonify({'error': 'Snapshot not found'}), 404
+
+    result = verify_snapshot(name)
+    return jsonify(result), 200 if result['ok'] else 500
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+
+from flask import Blueprint, request, jsonify, session
+from sqlalchemy import func, select
+
+from ..balances import balances_at, period_ends, refresh_balance_checkpoints
+from ..columnar import analytics_from_columns, cached_columns
+from ..extensions import db
+from ..models import Transaction
+from ..ratelimit import rate_limited
+from ..reports import ReportSpec, run_report
+from ..serialization import json_response
+from ..utils import handle_errors
+
+bp = Blueprint('analytics', __name__)
+
+@bp.route('/api/analytics')
+@rate_limited('heavy')
+@handle_errors
+def get_analytics():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        # Get date ranges
+        today = datetime.now()
+
+        # Hot users are answered from the in-memory columns when the cache is enabled
+        columns = cached_columns(session['user_id'])
+        if columns is not None:
+            payload = analytics_from_columns(columns, today)
+            payload['last_updated'] = datetime.now().isoformat()
+            return json_response(payload)
+
+        six_months_ago = today - timedelta(days=180)
+        
+        # Query only the columns the analysis needs, with the month key computed by SQLite
+        transactions = db.session.execute(select(
+            func.strftime('%Y-%m', Transaction.date),
+            Transaction.amount,
+            Transaction.category_type,
+            Transaction.category_group
+        ).where(
+            Transaction.user_id == session['user_id'],
+            Transaction.date >= six_months_ago
+        )).all()
+
+        # Calculate monthly summary
+        current_month = today.strftime('%Y-%m')
+        current_month_transactions = [t for t in transactions if t[0] == current_month]
+        monthly_income = sum(t[1] for t in current_month_transactions if t[2] == 'income')
+        monthly_expenses = abs(sum(t[1] for t in current_month_transactions if t[2] == 'expense'))
+        
+        # Calculate savings rate
+        savings_rate = 0
+        if monthly_income > 0:
+            savings_rate = ((monthly_income - monthly_expenses) / monthly_income) * 100
+
+        summary = {
+            'income': monthly_income,
+            'expenses': monthly_expenses,
+            'savings_rate': savings_rate
+        }
+
+        # Calculate category breakdown for current month
+        category_breakdown = {}
+        for month_key, amount, category_type, category_group in current_month_transactions:
+            if category_type == 'expense':  # Only track expenses in breakdown
+                if category_group not in category_breakdown:
+                    category_breakdown[category_group] = 0
+                category_breakdown[category_group] += abs(amount)
+
+        # Calculate monthly trends (last 6 months)
+        monthly_trends = {}
+        for month_key, amount, category_type, category_group in transactions:
+            if month_key not in monthly_trends:
+                monthly_trends[month_key] = {'income': 0, 'expenses': 0}
+            if category_type == 'income':
+                monthly_trends[month_key]['income'] += amount
+            else:
+                monthly_trends[month_key]['expenses'] += abs(amount)
+
+        # Sort monthly trends by date
+        monthly_trends = dict(sorted(monthly_trends.items()))
+
+        return json_response({
+            'summary': summary,
+            'category_breakdown': category_breakdown,
+            'monthly_trends': monthly_trends,
+            'last_updated': datetime.now().isoformat()
+        })
+
+    except Exception as e:
+        return jsonify({'error': f'Error calculating analytics: {str(e)}'}), 500
+
+@bp.route('/api/balance-history')
+@rate_limited('heavy')
+@handle_errors
+def get_balance_history():
+    """Running balance (income minus expenses) at the end of each day, week or month"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    granularity = request.args.get('granularity', 'month')
+    if granularity not in ('day', 'week', 'month'):
+        return jsonify({'error': 'Invalid granularity (expected day, week or month)'}), 400
+
+    try:
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if 'to' in request.args else datetime.now().date()
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if 'from' in request.args else end - timedelta(days=180)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format (expected YYYY-MM-DD)'}), 400
+    if start > end:
+        return jsonify({'error': 'from must not be after to'}), 400
+
+    points = period_ends(start, end, granularity)
+    if len(points) > 3660:
+        return jsonify({'error': 'Range too large for this granularity'}), 400
+
+    user_id = session['user_id']
+    refresh_balance_checkpoints(user_id)
+    opening, *balances = balances_at(user_id, [start - timedelta(days=1)] + points)
+
+    return json_response({
+        'granularity': granularity,
+        'opening_balance': opening,
+        'points': [{
+            'date': point.strftime('%Y-%m-%d'),
+            'balance': balance
+        } for point, balance in zip(points, balances)]
+    })
+
+@bp.route('/api/reports')
+@rate_limited('heavy')
+@handle_errors
+def get_report():
+    """Custom pivot: ?dimensions=period,category_group&measures=sum,count&period=month&from=&to=&category_type="""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d') if 'from' in request.args else None
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d') + timedelta(days=1) if 'to' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'Invalid date format (expected YYYY-MM-DD)'}), 400
+
+    try:
+        spec = ReportSpec(
+            dimensions=[d for d in request.args.get('dimensions', '').split(',') if d],
+            measures=[m for m in request.args.get('measures', 'sum').split(',') if m],
+            period=request.args.get('period', 'month'),
+            start=start,
+            end=end,
+            category_type=request.args.get('category_type')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    rows, cached = run_report(session['user_id'], spec)
+    return json_response({
+        'dimensions': spec.dimensions,
+        'measures': spec.measures,
+        'rows': rows,
+        'cached': cached
+    })
@@ -0,0 +1,67 @@
+from flask import Blueprint, render_template, request, session, redirect, url_for
+
+from ..categories import CATEGORY_STRUCTURE
+from ..extensions import db
+from ..models import User
+from ..passwords import HashingBusy, authenticate, get_hasher
+from ..ratelimit import rate_limited
+
+bp = Blueprint('auth', __name__)
+
+@bp.route('/')
+def index():
+    if 'user_id' not in session:
+        return redirect(url_for('auth.login'))
+    return render_template('index.html', 
+                         username=session.get('username'),
+                         categories=CATEGORY_STRUCTURE)
+
+@bp.route('/login', methods=['GET', 'POST'])
+@rate_limited('auth')
+def login():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        
+        try:
+            user_id = authenticate(username, password)
+        except HashingBusy:
+            return render_template('login.html', error='Too many sign-ins right now, please try again shortly'), 503
+        if user_id is not None:
+            session['user_id'] = user_id
+            session['username'] = username
+            return redirect(url_for('auth.index'))
+        return render_template('login.html', error='Invalid username or password')
+    return render_template('login.html')
+
+@bp.route('/register', methods=['GET', 'POST'])
+@rate_limited('auth')
+def register():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        email = request.form.get('email')
+        
+        if User.query.filter_by(username=username).first():
+            return render_template('register.html', error='Username already exists')
+            
+        try:
+            password_hash = get_hasher().hash(password)
+        except HashingBusy:
+            return render_template('register.html', error='Too many sign-ups right now, please try again shortly'), 503
+
+        user = User(
+            username=username,
+            password_hash=password_hash,
+            email=email
+        )
+        db.session.add(user)
+        db.session.commit()
+        
+        return redirect(url_for('auth.login'))
+    return render_template('register.html')
+
+@bp.route('/logout')
+def logout():
+    session.clear()
+    return redirect(url_for('auth.login'))
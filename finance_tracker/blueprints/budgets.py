@@ -0,0 +1,224 @@
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, session
+
+from ..categories import CATEGORY_STRUCTURE
+from ..changes import record_change
+from ..extensions import db
+from ..models import Budget, BudgetSnapshot
+from ..utils import handle_errors
+
+bp = Blueprint('budgets', __name__)
+
+@bp.route('/api/budget-status')
+@handle_errors
+def get_budget_status():
+    """Get real-time budget status"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        budgets = Budget.query.filter_by(user_id=session['user_id']).all()
+        status = []
+
+        for budget in budgets:
+            budget.close_elapsed_periods()
+            current_usage = budget.get_current_usage()
+            percentage_used = (current_usage / budget.monthly_limit) * 100 if budget.monthly_limit > 0 else 0
+            
+            status.append({
+                'category': budget.category,
+                'category_group': budget.category_group,
+                'limit': budget.monthly_limit,
+                'spent': current_usage,
+                'percentage': percentage_used,
+                'remaining': budget.monthly_limit - current_usage,
+                'status': 'danger' if percentage_used >= 100 else 
+                         'warning' if percentage_used >= budget.alert_threshold * 100 else 'good'
+            })
+
+        return jsonify({
+            'budgets': status,
+            'last_updated': datetime.now().isoformat()
+        })
+
+    except Exception as e:
+        return jsonify({'error': f'Error getting budget status: {str(e)}'}), 500
+
+
+
+# Update the handle_budgets route to include category validation
+@bp.route('/api/budgets', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@handle_errors
+def handle_budgets():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    if request.method == 'POST':
+        try:
+            data = request.json
+            
+            # Validate category exists
+            category_group = data.get('category_group')
+            category = data.get('category')
+            
+            if not category_group or category_group not in CATEGORY_STRUCTURE['expense']:
+                return jsonify({'error': 'Invalid category group'}), 400
+                
+            group_data = CATEGORY_STRUCTURE['expense'][category_group]
+            valid_categories = (
+                group_data if isinstance(group_data, list)
+                else list(group_data.keys())
+            )
+            
+            if not category or category not in valid_categories:
+                return jsonify({'error': 'Invalid category'}), 400
+
+            # Check for existing budget
+            existing_budget = Budget.query.filter_by(
+                user_id=session['user_id'],
+                category_group=data['category_group'],
+                category=data['category']
+            ).first()
+
+            if existing_budget:
+                return jsonify({'error': 'Budget already exists for this category'}), 400
+
+            budget = Budget(
+                category_group=data['category_group'],
+                category=data['category'],
+                monthly_limit=float(data['monthly_limit']),
+                alert_threshold=float(data.get('alert_threshold', 0.8)),
+                reset_day=int(data.get('reset_day', 1)),
+                user_id=session['user_id']
+            )
+            
+            # Validate monthly limit
+            if budget.monthly_limit <= 0:
+                return jsonify({'error': 'Monthly limit must be greater than 0'}), 400
+
+            db.session.add(budget)
+            db.session.flush()
+            record_change(session['user_id'], 'budgets', budget.id)
+            db.session.commit()
+            
+            return jsonify({
+                'message': 'Budget created successfully',
+                'budget': budget.get_status()
+            })
+
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+
+    elif request.method == 'GET':
+        budgets = Budget.query.filter_by(user_id=session['user_id']).all()
+        for budget in budgets:
+            budget.close_elapsed_periods()
+        return jsonify({
+            'budgets': [budget.get_status() for budget in budgets],
+            'last_updated': datetime.now().isoformat()
+        })
+
+    elif request.method == 'PUT':
+        try:
+            data = request.json
+            budget = Budget.query.get_or_404(data['id'])
+            if budget.user_id != session['user_id']:
+                return jsonify({'error': 'Unauthorized'}), 401
+
+            budget.monthly_limit = float(data.get('monthly_limit', budget.monthly_limit))
+            budget.alert_threshold = float(data.get('alert_threshold', budget.alert_threshold))
+            budget.reset_day = int(data.get('reset_day', budget.reset_day))
+            record_change(session['user_id'], 'budgets', budget.id)
+            db.session.commit()
+            return jsonify({'message': 'Budget updated successfully'})
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+
+    elif request.method == 'DELETE':
+        budget_id = request.args.get('id')
+        budget = Budget.query.get_or_404(budget_id)
+        if budget.user_id != session['user_id']:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        record_change(session['user_id'], 'budgets', budget.id, action='delete')
+        db.session.delete(budget)
+        db.session.commit()
+        return jsonify({'message': 'Budget deleted successfully'})
+
+    # GET request
+    budgets = Budget.query.filter_by(user_id=session['user_id']).all()
+    return jsonify([{
+        'id': b.id,
+        'category_group': b.category_group,
+        'category': b.category,
+        'monthly_limit': b.monthly_limit,
+        'alert_threshold': b.alert_threshold,
+        'reset_day': b.reset_day,
+        'current_usage': b.get_current_usage()
+    } for b in budgets])
+
+@bp.route('/api/budgets/<int:budget_id>/history')
+@handle_errors
+def get_budget_history(budget_id):
+    """Past budget periods, newest first, served from closed-period snapshots"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    budget = Budget.query.get_or_404(budget_id)
+    if budget.user_id != session['user_id']:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    periods = min(max(request.args.get('periods', 12, type=int), 1), 120)
+    budget.close_elapsed_periods()
+    snapshots = BudgetSnapshot.query.filter_by(budget_id=budget.id).order_by(
+        BudgetSnapshot.period_start.desc()
+    ).limit(periods).all()
+
+    return jsonify({
+        'budget_id': budget.id,
+        'category_group': budget.category_group,
+        'category': budget.category,
+        'current': budget.get_status(),
+        'history': [snapshot.to_dict() for snapshot in snapshots]
+    })
+
+
+
+@bp.route('/api/budgets', methods=['GET'])
+@handle_errors
+def get_budgets():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 6, type=int)  # 6 cards per page
+
+    # Get all budgets with pagination
+    pagination = Budget.query.filter_by(user_id=session['user_id']).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+
+    return jsonify({
+        'budgets': [budget.get_status() for budget in pagination.items],
+        'total': pagination.total,
+        'pages': pagination.pages,
+        'current_page': page,
+        'per_page': per_page,
+        'has_next': pagination.has_next,
+        'has_prev': pagination.has_prev,
+        'last_updated': datetime.now().isoformat()
+    })
+
+@bp.route('/api/budgets/<int:budget_id>', methods=['GET'])
+@handle_errors
+def get_budget(budget_id):
+    """Get a specific budget by ID"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    budget = Budget.query.get_or_404(budget_id)
+    if budget.user_id != session['user_id']:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    return jsonify(budget.get_status())
@@ -0,0 +1,77 @@
+from flask import Blueprint, jsonify
+
+from ..categories import CATEGORY_STRUCTURE
+from ..utils import handle_errors
+
+bp = Blueprint('categories', __name__)
+
+# Route for all categories
+@bp.route('/api/categories')
+@handle_errors
+def get_categories():
+    """Get all available categories"""
+    return jsonify(CATEGORY_STRUCTURE)
+
+# Route for category groups by type
+@bp.route('/api/categories/<category_type>')
+@handle_errors
+def get_category_groups(category_type):
+    """Get category groups for a specific type"""
+    if category_type not in CATEGORY_STRUCTURE:
+        return jsonify({'error': 'Invalid category type'}), 400
+    return jsonify(CATEGORY_STRUCTURE[category_type])
+
+@bp.route('/api/categories/<category_type>/<category_group>')
+@handle_errors
+def get_category_details(category_type, category_group):
+    """Get categories for a specific type and group"""
+    try:
+        if category_type not in CATEGORY_STRUCTURE:
+            return jsonify({'error': 'Invalid category type'}), 400
+        if category_group not in CATEGORY_STRUCTURE[category_type]:
+            return jsonify({'error': 'Invalid category group'}), 400
+            
+        categories = CATEGORY_STRUCTURE[category_type][category_group]
+        return jsonify(categories)
+        
+    except Exception as e:
+        return jsonify({'error': f'Error getting categories: {str(e)}'}), 500
+
+@bp.route('/api/categories/<category_type>/<category_group>/<category>')
+@handle_errors
+def get_subcategories(category_type, category_group, category):
+    """Get subcategories for a specific category"""
+    try:
+        if (category_type not in CATEGORY_STRUCTURE or
+            category_group not in CATEGORY_STRUCTURE[category_type] or
+            category not in CATEGORY_STRUCTURE[category_type][category_group]):
+            return jsonify({'error': 'Invalid category path'}), 400
+            
+        subcategories = CATEGORY_STRUCTURE[category_type][category_group][category]
+        return jsonify(subcategories)
+        
+    except Exception as e:
+        return jsonify({'error': f'Error getting subcategories: {str(e)}'}), 500
+
+
+
+@bp.route('/api/categories/expense/<category_group>/budget-categories')
+@handle_errors
+def get_budget_categories(category_group):
+    """Get available categories for budgeting from a specific group"""
+    try:
+        if category_group not in CATEGORY_STRUCTURE['expense']:
+            return jsonify({'error': 'Invalid category group'}), 400
+            
+        group_data = CATEGORY_STRUCTURE['expense'][category_group]
+        if isinstance(group_data, list):
+            # If the group directly contains categories
+            categories = group_data
+        else:
+            # If the group contains subcategories
+            categories = list(group_data.keys())
+            
+        return jsonify(categories)
+        
+    except Exception as e:
+        return jsonify({'error': f'Error getting budget categories: {str(e)}'}), 500
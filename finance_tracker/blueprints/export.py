@@ -0,0 +1,176 @@
+import io
+import csv
+import math
+from datetime import datetime, timedelta
+
+from flask import Blueprint, request, jsonify, session, send_file
+
+from ..archive import archived_fingerprints, archived_rows, reaches_archive
+from ..balances import invalidate_balance_checkpoints
+from ..categories import CATEGORY_STRUCTURE
+from ..changes import record_transaction_changes
+from ..columnar import append_transactions
+from ..extensions import db
+from ..fingerprints import near_duplicate_fingerprints, transaction_fingerprint
+from ..models import Transaction
+from ..ratelimit import rate_limited
+from ..serialization import EXPORT_FIELDS, dumps, fetch_rows, serialize_rows
+from ..utils import handle_errors
+
+bp = Blueprint('export', __name__)
+
+@bp.route('/api/export')
+@rate_limited('heavy')
+@handle_errors
+def export_data():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    export_type = request.args.get('type', 'transactions')
+    format_type = request.args.get('format', 'csv')
+
+    if export_type not in EXPORT_FIELDS:
+        return jsonify({'error': 'Invalid export type'}), 400
+
+    model, fields = EXPORT_FIELDS[export_type]
+    data = fetch_rows(fields, model.user_id == session['user_id'])
+    if export_type == 'transactions':
+        # Archived rows in the same shape, with the date text SQLite would have stored
+        data = [
+            tuple(row['date'].strftime('%Y-%m-%d %H:%M:%S.%f') if name == 'date' else row[name] for name, _ in fields)
+            for row in archived_rows(session['user_id'])
+        ] + list(data)
+
+    if format_type == 'csv':
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow([name for name, _ in fields])
+        writer.writerows(data)
+
+        output.seek(0)
+        return send_file(
+            io.BytesIO(output.getvalue().encode('utf-8')),
+            mimetype='text/csv',
+            as_attachment=True,
+            download_name=f'{export_type}.csv'
+        )
+    elif format_type == 'json':
+        result = serialize_rows(fields, data)
+        return send_file(
+            io.BytesIO(dumps(result, indent=True)),
+            mimetype='application/json',
+            as_attachment=True,
+            download_name=f'{export_type}.json'
+        )
+
+@bp.route('/api/import', methods=['POST'])
+@rate_limited('bulk')
+@handle_errors
+def import_data():
+    """Import transactions from a CSV in the export format, skipping duplicates"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({'error': 'No file provided'}), 400
+
+    user_id = session['user_id']
+    skip_near_duplicates = request.args.get('skip_near_duplicates', 'false').lower() == 'true'
+    reader = csv.DictReader(io.StringIO(upload.read().decode('utf-8-sig')))
+
+    rows = []
+    errors = []
+    for line_number, row in enumerate(reader, start=2):
+        try:
+            # Same rules as POST /api/transactions, so a bad line never reaches the flush
+            category_type = row['category_type']
+            if category_type not in CATEGORY_STRUCTURE:
+                raise ValueError('Invalid category type')
+            if row['category_group'] not in CATEGORY_STRUCTURE[category_type]:
+                raise ValueError('Invalid category group')
+            group_data = CATEGORY_STRUCTURE[category_type][row['category_group']]
+            valid_categories = group_data if isinstance(group_data, list) else list(group_data.keys())
+            if row['category'] not in valid_categories:
+                raise ValueError('Invalid category')
+            if not row['description']:
+                raise ValueError('Missing description')
+            date = datetime.fromisoformat(row['date'])
+            amount = float(row['amount'])
+            if not math.isfinite(amount) or amount == 0:
+                raise ValueError('Amount must be a finite, non-zero number')
+            # Unlike POST, negative expenses are allowed on purpose: exports of older rows carry
+            # them signed and must import back unchanged (every reader takes abs() of expenses)
+            if amount < 0 and category_type == 'income':
+                raise ValueError('Income amount must be greater than 0')
+            rows.append((line_number, row, date, amount, transaction_fingerprint(
+                user_id, date, amount, row['description'], category_type
+            )))
+        except KeyError as e:
+            errors.append({'line': line_number, 'error': f'Missing column: {e.args[0]}'})
+        except (TypeError, ValueError) as e:
+            errors.append({'line': line_number, 'error': str(e)})
+
+    # One indexed IN lookup per chunk instead of scanning the user's history per row
+    seen = set()
+    candidates = set()
+    for row in rows:
+        candidates.add(row[4])
+        if skip_near_duplicates:
+            candidates.update(near_duplicate_fingerprints(
+                user_id, row[2], row[3], row[1]['description'], row[1]['category_type']
+            ))
+    candidates = list(candidates)
+    for start in range(0, len(candidates), 500):
+        seen.update(fp for (fp,) in db.session.query(Transaction.fingerprint).filter(
+            Transaction.user_id == user_id,
+            Transaction.fingerprint.in_(candidates[start:start + 500])
+        ))
+    # Lines dated in the archived range are checked against the archive files too
+    if rows and reaches_archive(user_id, min(row[2] for row in rows)):
+        seen.update(archived_fingerprints(
+            user_id, min(row[2] for row in rows) - timedelta(days=1), max(row[2] for row in rows) + timedelta(days=2)
+        ))
+
+    imported = []
+    earliest = None
+    duplicates = []
+    near_duplicates = []
+    for line_number, row, date, amount, fingerprint in rows:
+        if fingerprint in seen:
+            duplicates.append(line_number)
+            continue
+        if skip_near_duplicates and any(
+            fp in seen for fp in near_duplicate_fingerprints(user_id, date, amount, row['description'], row['category_type'])
+        ):
+            near_duplicates.append(line_number)
+            continue
+        transaction = Transaction(
+            date=date,
+            description=row['description'],
+            amount=amount,
+            category_type=row['category_type'],
+            category_group=row['category_group'],
+            category=row['category'],
+            notes=row.get('notes') or '',
+            user_id=user_id,
+            fingerprint=fingerprint
+        )
+        db.session.add(transaction)
+        seen.add(fingerprint)
+        imported.append(transaction)
+        earliest = date if earliest is None else min(earliest, date)
+    if earliest is not None:
+        invalidate_balance_checkpoints(user_id, earliest)
+    db.session.flush()
+    record_transaction_changes(user_id, imported)
+    db.session.commit()
+    append_transactions(user_id, imported)
+
+    return jsonify({
+        'message': f'Imported {len(imported)} transactions',
+        'imported': len(imported),
+        'duplicate_lines': duplicates,
+        'near_duplicate_lines': near_duplicates,
+        'errors': errors
+    })
@@ -0,0 +1,184 @@
+from datetime import datetime
+
+from flask import Blueprint, current_app, request, jsonify, session
+
+from ..changes import record_change
+from ..extensions import db
+from ..models import SavingsGoal, Transaction
+from ..ratelimit import rate_limited
+from ..serialization import GOAL_TRANSACTION_FIELDS, fetch_rows, json_response, serialize_rows
+from ..simulation import simulate_goals
+from ..utils import handle_errors
+
+bp = Blueprint('goals', __name__)
+
+@bp.route('/api/savings-goals', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@handle_errors
+def handle_savings_goals():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    if request.method == 'POST':
+        try:
+            data = request.json
+            
+            # Validate required fields
+            required_fields = ['name', 'target_amount', 'target_date', 'category']
+            missing_fields = [field for field in required_fields if field not in data]
+            if missing_fields:
+                return jsonify({
+                    'error': 'Missing required fields',
+                    'missing_fields': missing_fields
+                }), 400
+
+            # Validate target amount
+            try:
+                target_amount = float(data['target_amount'])
+                if target_amount <= 0:
+                    return jsonify({'error': 'Target amount must be greater than 0'}), 400
+            except (ValueError, TypeError):
+                return jsonify({'error': 'Invalid target amount format'}), 400
+
+            # Validate target date
+            try:
+                target_date = datetime.strptime(data['target_date'], '%Y-%m-%d')
+                if target_date < datetime.now():
+                    return jsonify({'error': 'Target date cannot be in the past'}), 400
+            except ValueError:
+                return jsonify({'error': 'Invalid target date format (expected YYYY-MM-DD)'}), 400
+
+            goal = SavingsGoal(
+                name=data['name'],
+                target_amount=target_amount,
+                current_amount=float(data.get('current_amount', 0)),
+                target_date=target_date,
+                category=data['category'],
+                priority=int(data.get('priority', 1)),
+                user_id=session['user_id']
+            )
+            
+            db.session.add(goal)
+            db.session.flush()
+            record_change(session['user_id'], 'savings_goals', goal.id)
+            db.session.commit()
+            return jsonify({
+                'message': 'Savings goal created successfully',
+                'goal': goal.get_status()
+            })
+
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+
+    elif request.method == 'PUT':
+        try:
+            data = request.json
+            goal = SavingsGoal.query.get_or_404(data['id'])
+            if goal.user_id != session['user_id']:
+                return jsonify({'error': 'Unauthorized'}), 401
+
+            # Update fields with validation
+            if 'name' in data:
+                goal.name = data['name']
+                
+            if 'target_amount' in data:
+                try:
+                    target_amount = float(data['target_amount'])
+                    if target_amount <= 0:
+                        return jsonify({'error': 'Target amount must be greater than 0'}), 400
+                    goal.target_amount = target_amount
+                except (ValueError, TypeError):
+                    return jsonify({'error': 'Invalid target amount format'}), 400
+                    
+            if 'current_amount' in data:
+                try:
+                    current_amount = float(data['current_amount'])
+                    if current_amount < 0:
+                        return jsonify({'error': 'Current amount cannot be negative'}), 400
+                    goal.current_amount = min(current_amount, goal.target_amount)
+                except (ValueError, TypeError):
+                    return jsonify({'error': 'Invalid current amount format'}), 400
+                    
+            if 'target_date' in data:
+                try:
+                    target_date = datetime.strptime(data['target_date'], '%Y-%m-%d')
+                    if target_date < datetime.now():
+                        return jsonify({'error': 'Target date cannot be in the past'}), 400
+                    goal.target_date = target_date
+                except ValueError:
+                    return jsonify({'error': 'Invalid target date format (expected YYYY-MM-DD)'}), 400
+                    
+            if 'category' in data:
+                goal.category = data['category']
+                
+            if 'priority' in data:
+                try:
+                    priority = int(data['priority'])
+                    if priority < 1 or priority > 5:
+                        return jsonify({'error': 'Priority must be between 1 and 5'}), 400
+                    goal.priority = priority
+                except (ValueError, TypeError):
+                    return jsonify({'error': 'Invalid priority format'}), 400
+
+            record_change(session['user_id'], 'savings_goals', goal.id)
+            db.session.commit()
+            return jsonify({
+                'message': 'Savings goal updated successfully',
+                'goal': goal.get_status()
+            })
+
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+
+    elif request.method == 'DELETE':
+        goal_id = request.args.get('id')
+        goal = SavingsGoal.query.get_or_404(goal_id)
+        if goal.user_id != session['user_id']:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        record_change(session['user_id'], 'savings_goals', goal.id, action='delete')
+        db.session.delete(goal)
+        db.session.commit()
+        return jsonify({'message': 'Savings goal deleted successfully'})
+
+    # GET request
+    goals = SavingsGoal.query.filter_by(user_id=session['user_id']).all()
+    return jsonify([goal.get_status() for goal in goals])
+
+@bp.route('/api/savings-goals/<int:goal_id>/transactions')
+@handle_errors
+def get_goal_transactions(goal_id):
+    """Get all transactions associated with a specific goal"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+        
+    goal = SavingsGoal.query.get_or_404(goal_id)
+    if goal.user_id != session['user_id']:
+        return jsonify({'error': 'Unauthorized'}), 401
+        
+    rows = fetch_rows(
+        GOAL_TRANSACTION_FIELDS,
+        Transaction.savings_goal_id == goal_id,
+        order_by=Transaction.date.desc()
+    )
+    return json_response(serialize_rows(GOAL_TRANSACTION_FIELDS, rows))
+
+@bp.route('/api/savings-goals/simulation')
+@rate_limited('heavy')
+@handle_errors
+def get_goal_simulation():
+    """Probability of reaching each goal by its target date, and when it completes: ?paths=10000&seed=0"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        paths = int(request.args.get('paths', 10000))
+        seed = int(request.args.get('seed', 0))
+    except ValueError:
+        return jsonify({'error': 'paths and seed must be integers'}), 400
+    if not 1 <= paths <= current_app.config['SIMULATION_MAX_PATHS']:
+        return jsonify({'error': f"paths must be between 1 and {current_app.config['SIMULATION_MAX_PATHS']}"}), 400
+    if seed < 0:
+        return jsonify({'error': 'seed must not be negative'}), 400
+
+    result, cached = simulate_goals(session['user_id'], paths, seed)
+    return json_response(dict(result, cached=cached))
@@ -0,0 +1,89 @@
+from flask import Blueprint, request, jsonify, session
+from sqlalchemy import func
+
+from ..extensions import db
+from ..models import Budget, ChangeLog, SavingsGoal, Transaction
+from ..serialization import TRANSACTION_FIELDS, fetch_rows, json_response, serialize_rows
+from ..sharding import get_router
+from ..utils import handle_errors
+
+bp = Blueprint('sync', __name__)
+
+ENTITIES = ('transactions', 'budgets', 'savings_goals')
+
+def load_entities(user_id, ids_by_entity):
+    """Current rows for the given ids, or everything for an entity whose ids are None"""
+    result = {}
+    for entity in ENTITIES:
+        ids = ids_by_entity.get(entity)
+        if ids is not None and not ids:
+            result[entity] = []
+            continue
+        if entity == 'transactions':
+            criteria = [Transaction.user_id == user_id]
+            if ids is not None:
+                criteria.append(Transaction.id.in_(ids))
+            rows = fetch_rows(TRANSACTION_FIELDS, *criteria, order_by=Transaction.date.desc())
+            result[entity] = serialize_rows(TRANSACTION_FIELDS, rows)
+        else:
+            model = Budget if entity == 'budgets' else SavingsGoal
+            query = model.query.filter(model.user_id == user_id)
+            if ids is not None:
+                query = query.filter(model.id.in_(ids))
+            result[entity] = [item.get_status() for item in query.order_by(model.id)]
+    return result
+
+@bp.route('/api/sync')
+@handle_errors
+def sync_changes():
+    """Rows created, updated or deleted since the cursor; without one, a full snapshot"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    user_id = session['user_id']
+    since = request.args.get('since', type=int)
+    limit = min(max(request.args.get('limit', 1000, type=int), 1), 5000)
+
+    # A cursor handed out before the user moved shards doesn't order against this shard's log
+    _, resync_floor = get_router().assignment(user_id)
+    if since is None or since < resync_floor:
+        # Take the cursor first: a write racing the snapshot is re-sent next sync, never lost
+        cursor = db.session.query(func.max(ChangeLog.id)).filter(
+            ChangeLog.user_id == user_id
+        ).scalar() or 0
+        payload = load_entities(user_id, {})
+        payload.update({
+            'deleted': {entity: [] for entity in ENTITIES},
+            'cursor': cursor,
+            'has_more': False,
+            'full': True
+        })
+        return json_response(payload)
+
+    entries = db.session.query(
+        ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.action
+    ).filter(
+        ChangeLog.user_id == user_id,
+        ChangeLog.id > since
+    ).order_by(ChangeLog.id).limit(limit + 1).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Several changes to one row collapse into its latest action
+    latest = {}
+    for _, entity, entity_id, action in entries:
+        latest[(entity, entity_id)] = action
+    upserts = {entity: [] for entity in ENTITIES}
+    deleted = {entity: [] for entity in ENTITIES}
+    for (entity, entity_id), action in latest.items():
+        if entity in ENTITIES:
+            (deleted if action == 'delete' else upserts)[entity].append(entity_id)
+
+    payload = load_entities(user_id, upserts)
+    payload.update({
+        'deleted': deleted,
+        'cursor': entries[-1].id if entries else since,
+        'has_more': has_more,
+        'full': False
+    })
+    return json_response(payload)
@@ -0,0 +1,350 @@
+from datetime import datetime, timedelta
+
+from flask import Blueprint, request, jsonify, session
+from sqlalchemy import func
+
+from ..archive import archived_rows, reaches_archive
+from ..balances import invalidate_balance_checkpoints
+from ..categories import CATEGORY_STRUCTURE
+from ..changes import record_transaction_changes
+from ..columnar import append_transactions
+from ..extensions import db
+from ..fingerprints import near_duplicate_fingerprints
+from ..models import SavingsGoal, Transaction
+from ..ratelimit import rate_limited
+from ..serialization import TRANSACTION_FIELDS, fetch_rows, json_response, serialize_rows
+from ..utils import handle_errors
+
+bp = Blueprint('transactions', __name__)
+
+def find_duplicate(user_id, fingerprint, exclude_id=None):
+    """Indexed lookup of an existing transaction with the given fingerprint"""
+    query = Transaction.query.filter_by(user_id=user_id, fingerprint=fingerprint)
+    if exclude_id is not None:
+        query = query.filter(Transaction.id != exclude_id)
+    return query.first()
+
+def find_near_duplicates(user_id, date, amount, description, category_type, exclude_id=None):
+    """Indexed lookup of transactions that only differ by a day from the given one"""
+    fingerprints = near_duplicate_fingerprints(user_id, date, amount, description, category_type)
+    query = Transaction.query.filter(
+        Transaction.user_id == user_id,
+        Transaction.fingerprint.in_(fingerprints)
+    )
+    if exclude_id is not None:
+        query = query.filter(Transaction.id != exclude_id)
+    return query.all()
+
+
+
+@bp.route('/api/transactions', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@handle_errors
+def handle_transactions():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    if request.method == 'POST':
+        try:
+            print("Received transaction request:", request.data)  # Log raw request data
+            
+            if not request.is_json:
+                return jsonify({'error': 'Request must be JSON'}), 400
+                
+            data = request.get_json()
+            print("Parsed JSON data:", data)  # Log parsed JSON
+            
+            if not data:
+                return jsonify({'error': 'No data provided'}), 400
+
+            required_fields = ['description', 'amount', 'category_type', 'category_group', 'category']
+            missing_fields = [field for field in required_fields if field not in data]
+            if missing_fields:
+                return jsonify({
+                    'error': 'Missing required fields',
+                    'missing_fields': missing_fields
+                }), 400
+
+            # Validate amount is a number
+            try:
+                amount = float(data['amount'])
+                if amount <= 0:
+                    return jsonify({'error': 'Amount must be greater than 0'}), 400
+            except (ValueError, TypeError) as e:
+                print(f"Amount validation error: {str(e)}")
+                return jsonify({'error': 'Invalid amount format'}), 400
+
+            # Validate category type
+            if data['category_type'] not in ['income', 'expense']:
+                print(f"Invalid category type: {data['category_type']}")
+                return jsonify({'error': 'Invalid category type'}), 400
+
+            # Validate category exists in structure
+            if data['category_type'] not in CATEGORY_STRUCTURE:
+                print(f"Invalid category type in structure: {data['category_type']}")
+                return jsonify({'error': 'Invalid category type'}), 400
+                
+            if data['category_group'] not in CATEGORY_STRUCTURE[data['category_type']]:
+                print(f"Invalid category group: {data['category_group']}")
+                return jsonify({'error': 'Invalid category group'}), 400
+                
+            group_data = CATEGORY_STRUCTURE[data['category_type']][data['category_group']]
+            valid_categories = group_data if isinstance(group_data, list) else list(group_data.keys())
+            
+            if data['category'] not in valid_categories:
+                print(f"Invalid category: {data['category']}")
+                return jsonify({'error': 'Invalid category'}), 400
+
+            transaction = Transaction(
+                description=data['description'],
+                amount=amount,
+                category_type=data['category_type'],
+                category_group=data['category_group'],
+                category=data['category'],
+                notes=data.get('notes', ''),
+                is_recurring=data.get('is_recurring', False),
+                recurring_frequency=data.get('recurring_frequency'),
+                user_id=session['user_id']
+            )
+            
+            print("Creating transaction:", transaction.__dict__)
+
+            # Reject exact re-submissions and flag the same entry posted a day apart
+            transaction.refresh_fingerprint()
+            duplicate = find_duplicate(session['user_id'], transaction.fingerprint)
+            if duplicate and not data.get('allow_duplicate'):
+                return jsonify({
+                    'error': 'Duplicate transaction',
+                    'duplicate_id': duplicate.id
+                }), 409
+            near_duplicates = find_near_duplicates(
+                session['user_id'], transaction.date, amount, transaction.description, transaction.category_type
+            )
+            
+            # Check if this transaction matches any savings goal
+            if data['category_type'] == 'income':
+                savings_goal = SavingsGoal.query.filter_by(
+                    user_id=session['user_id'],
+                    category=data['category']
+                ).first()
+                
+                if savings_goal:
+                    transaction.savings_goal_id = savings_goal.id
+                    savings_goal.current_amount = min(
+                        savings_goal.current_amount + float(data['amount']),
+                        savings_goal.target_amount
+                    )
+                    db.session.add(savings_goal)
+            
+            # Check if transaction should be linked to a goal
+            goal_id = data.get('savings_goal_id')
+            if goal_id:
+                goal = SavingsGoal.query.get(goal_id)
+                if not goal or goal.user_id != session['user_id']:
+                    return jsonify({'error': 'Invalid savings goal'}), 400
+                transaction.savings_goal_id = goal_id
+            
+            db.session.add(transaction)
+            invalidate_balance_checkpoints(session['user_id'], transaction.date)
+            db.session.commit()
+            
+            # Update goal progress if linked
+            transaction.update_savings_goal()
+
+            # Logged after the goal update so a sync never sees the entry before the new amount
+            record_transaction_changes(session['user_id'], [transaction])
+            db.session.commit()
+            append_transactions(session['user_id'], [transaction])
+
+            return jsonify({
+                'message': 'Transaction added successfully',
+                'id': transaction.id,
+                'goal_updated': bool(goal_id),
+                'possible_duplicates': [t.id for t in near_duplicates]
+            })
+
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+
+    elif request.method == 'PUT':
+        data = request.json
+        transaction = Transaction.query.get_or_404(data['id'])
+        if transaction.user_id != session['user_id']:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        previous_category = (transaction.category_group, transaction.category)
+
+        # Update transaction fields
+        for field in ['description', 'amount', 'category_type', 'category_group', 'category', 'notes', 'is_recurring', 'recurring_frequency']:
+            if field in data:
+                setattr(transaction, field, data[field])
+
+        previous_fingerprint = transaction.fingerprint
+        transaction.refresh_fingerprint()
+        # Only a change to the fingerprinted fields can create a new duplicate
+        duplicate = None
+        if transaction.fingerprint != previous_fingerprint:
+            duplicate = find_duplicate(session['user_id'], transaction.fingerprint, exclude_id=transaction.id)
+        if duplicate and not data.get('allow_duplicate'):
+            db.session.rollback()
+            return jsonify({
+                'error': 'Update would duplicate an existing transaction',
+                'duplicate_id': duplicate.id
+            }), 409
+
+        invalidate_balance_checkpoints(session['user_id'], transaction.date)
+        record_transaction_changes(session['user_id'], [transaction], previous_categories=[previous_category])
+        db.session.commit()
+        return jsonify({'message': 'Transaction updated successfully'})
+
+    elif request.method == 'DELETE':
+        transaction_id = request.args.get('id')
+        transaction = Transaction.query.get_or_404(transaction_id)
+        if transaction.user_id != session['user_id']:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        record_transaction_changes(session['user_id'], [transaction], action='delete')
+        db.session.delete(transaction)
+        invalidate_balance_checkpoints(session['user_id'], transaction.date)
+        db.session.commit()
+        return jsonify({'message': 'Transaction deleted successfully'})
+
+    # GET request with enhanced filtering
+    filter_params = {
+        'category_type': request.args.get('category_type'),
+        'category_group': request.args.get('category_group'),
+        'category': request.args.get('category'),
+        'date_from': request.args.get('from'),
+        'date_to': request.args.get('to'),
+        'min_amount': request.args.get('min_amount'),
+        'max_amount': request.args.get('max_amount')
+    }
+
+    criteria = [Transaction.user_id == session['user_id']]
+
+    # Apply filters
+    if filter_params['category_type']:
+        criteria.append(Transaction.category_type == filter_params['category_type'])
+    if filter_params['category_group']:
+        criteria.append(Transaction.category_group == filter_params['category_group'])
+    if filter_params['category']:
+        criteria.append(Transaction.category == filter_params['category'])
+    if filter_params['date_from']:
+        criteria.append(Transaction.date >= datetime.strptime(filter_params['date_from'], '%Y-%m-%d'))
+    if filter_params['date_to']:
+        criteria.append(Transaction.date <= datetime.strptime(filter_params['date_to'], '%Y-%m-%d'))
+    if filter_params['min_amount']:
+        criteria.append(Transaction.amount >= float(filter_params['min_amount']))
+    if filter_params['max_amount']:
+        criteria.append(Transaction.amount <= float(filter_params['max_amount']))
+
+    rows = serialize_rows(TRANSACTION_FIELDS, fetch_rows(TRANSACTION_FIELDS, *criteria, order_by=Transaction.date.desc()))
+
+    # Include cold-storage rows when the requested range reaches the user's archive
+    date_from = datetime.strptime(filter_params['date_from'], '%Y-%m-%d') if filter_params['date_from'] else None
+    date_to = datetime.strptime(filter_params['date_to'], '%Y-%m-%d') if filter_params['date_to'] else None
+    if reaches_archive(session['user_id'], date_from):
+        archived = [
+            row for row in archived_rows(session['user_id'], date_from, date_to and date_to + timedelta(microseconds=1))
+            if all(
+                not filter_params[key] or row[key] == filter_params[key]
+                for key in ('category_type', 'category_group', 'category')
+            )
+            and (not filter_params['min_amount'] or row['amount'] >= float(filter_params['min_amount']))
+            and (not filter_params['max_amount'] or row['amount'] <= float(filter_params['max_amount']))
+        ]
+        archived.sort(key=lambda row: row['date'], reverse=True)
+        rows += [dict(
+            {name: row[name] for name, _ in TRANSACTION_FIELDS},
+            date=row['date'].strftime('%Y-%m-%d'),
+            archived=True
+        ) for row in archived]
+        rows.sort(key=lambda row: row['date'], reverse=True)
+
+    return json_response(rows)
+
+@bp.route('/api/transactions/<int:transaction_id>', methods=['GET'])
+@handle_errors
+def get_transaction(transaction_id):
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+        
+    transaction = Transaction.query.get_or_404(transaction_id)
+    if transaction.user_id != session['user_id']:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    rows = fetch_rows(TRANSACTION_FIELDS, Transaction.id == transaction_id)
+    return json_response(serialize_rows(TRANSACTION_FIELDS, rows)[0])
+
+@bp.route('/api/transactions/duplicates', methods=['GET', 'POST'])
+@rate_limited('bulk')
+@handle_errors
+def merge_duplicate_transactions():
+    """Find (GET) or merge (POST) existing duplicate transactions in batches"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    user_id = session['user_id']
+    batch_size = min(max(request.args.get('batch_size', 100, type=int), 1), 1000)
+
+    # Rows written before fingerprints existed get theirs on the way through
+    unfingerprinted = Transaction.query.filter_by(
+        user_id=user_id, fingerprint=None
+    ).limit(batch_size).all()
+    for t in unfingerprinted:
+        t.refresh_fingerprint()
+    if unfingerprinted:
+        db.session.commit()
+
+    groups = db.session.query(
+        Transaction.fingerprint,
+        func.count(Transaction.id)
+    ).filter(
+        Transaction.user_id == user_id,
+        Transaction.fingerprint.isnot(None)
+    ).group_by(Transaction.fingerprint).having(
+        func.count(Transaction.id) > 1
+    ).limit(batch_size).all()
+
+    if request.method == 'GET':
+        return jsonify({
+            'duplicate_groups': [{
+                'transaction_ids': [t.id for t in Transaction.query.filter_by(
+                    user_id=user_id, fingerprint=fingerprint
+                ).order_by(Transaction.id)],
+                'count': count
+            } for fingerprint, count in groups],
+            'fingerprints_backfilled': len(unfingerprinted)
+        })
+
+    merged = 0
+    keepers = []
+    removed = []
+    for fingerprint, _ in groups:
+        keeper, *duplicates = Transaction.query.filter_by(
+            user_id=user_id, fingerprint=fingerprint
+        ).order_by(Transaction.id).all()
+        notes = [keeper.notes] if keeper.notes else []
+        for duplicate in duplicates:
+            if duplicate.notes and duplicate.notes not in notes:
+                notes.append(duplicate.notes)
+            if not keeper.savings_goal_id and duplicate.savings_goal_id:
+                keeper.savings_goal_id = duplicate.savings_goal_id
+            keeper.is_recurring = keeper.is_recurring or duplicate.is_recurring
+            keeper.recurring_frequency = keeper.recurring_frequency or duplicate.recurring_frequency
+            invalidate_balance_checkpoints(user_id, duplicate.date)
+            removed.append(duplicate)
+            db.session.delete(duplicate)
+            merged += 1
+        keeper.notes = '\n'.join(notes)
+        keepers.append(keeper)
+    record_transaction_changes(user_id, removed, action='delete')
+    record_transaction_changes(user_id, keepers)
+    db.session.commit()
+
+    return jsonify({
+        'message': f'Merged {merged} duplicate transactions',
+        'groups_merged': len(groups),
+        'transactions_removed': merged,
+        'fingerprints_backfilled': len(unfingerprinted),
+        'has_more': len(groups) == batch_size or len(unfingerprinted) == batch_size
+    })
@@ -0,0 +1,42 @@
+# Category Structure
+CATEGORY_STRUCTURE = {
+    'income': {
+        'Regular Income': {
+            'Salary/Wages': ['Full-time', 'Part-time', 'Contract'],
+            'Business Income': ['Sales', 'Services', 'Other'],
+            'Freelance Income': ['Projects', 'Consulting', 'Other']
+        },
+        'Passive Income': {
+            'Investments': ['Dividends', 'Interest', 'Capital Gains'],
+            'Rental Income': ['Residential', 'Commercial', 'Other'],
+            'Royalties': ['Books', 'Music', 'Patents']
+        }
+    },
+    'expense': {
+        'Housing & Utilities': {
+            'Housing': ['Rent', 'Mortgage', 'Property Tax'],
+            'Utilities': ['Electricity', 'Water', 'Gas', 'Internet'],
+            'Maintenance': ['Repairs', 'Insurance', 'HOA']
+        },
+        'Transportation': {
+            'Vehicle': ['Car Payment', 'Insurance', 'Maintenance'],
+            'Fuel': ['Gas', 'Charging', 'Other'],
+            'Public Transit': ['Bus', 'Train', 'Rideshare']
+        },
+        'Living Expenses': ['Groceries', 'Healthcare', 'Personal Care'],
+        'Lifestyle': ['Dining Out', 'Entertainment', 'Shopping'],
+        'Bills & Insurance': ['Insurance', 'Phone/Internet', 'Subscriptions'],
+        'Savings & Investments': ['Emergency Fund', 'Investments', 'Retirement'],
+        'Education': ['Tuition', 'Books', 'Training'],
+        'Others': ['Gifts', 'Miscellaneous', 'Unexpected Expenses']
+    }
+}
+
+
+
+def validate_category_path(type, group, category, subcategory):
+    """Validate that a category path exists in the CATEGORY_STRUCTURE"""
+    try:
+        return (subcategory in CATEGORY_STRUCTURE[type][group][category])
+    except (KeyError, TypeError):
+        return False
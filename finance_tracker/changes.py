@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import func
+
+from .extensions import db
+from .models import Budget, ChangeLog, invalidate_budget_snapshots
+
+
+def record_change(user_id, entity, entity_id, action='upsert'):
+    """Append one entry to the user's change log; committed with the caller's write"""
+    record_changes(user_id, entity, [entity_id], action)
+
+def record_changes(user_id, entity, entity_ids, action='upsert'):
+    if not entity_ids:
+        return
+    now = datetime.utcnow()
+    db.session.execute(ChangeLog.__table__.insert(), [{
+        'user_id': user_id,
+        'entity': entity,
+        'entity_id': entity_id,
+        'action': action,
+        'created_at': now
+    } for entity_id in entity_ids])
+
+def record_transaction_changes(user_id, transactions, action='upsert', previous_categories=()):
+    """Log changed transactions plus the goals and budgets whose figures they move.
+
+    Closed periods of those budgets from the earliest transaction onward are marked stale,
+    the same way balance checkpoints are invalidated.
+    """
+    record_changes(user_id, 'transactions', [t.id for t in transactions], action)
+
+    goal_ids = {t.savings_goal_id for t in transactions if t.savings_goal_id}
+    record_changes(user_id, 'savings_goals', sorted(goal_ids))
+
+    categories = {(t.category_group, t.category) for t in transactions if t.category_type == 'expense'}
+    categories.update(previous_categories)
+    if categories:
+        budget_ids = [budget_id for budget_id, group, category in db.session.query(
+            Budget.id, Budget.category_group, Budget.category
+        ).filter(Budget.user_id == user_id) if (group, category) in categories]
+        record_changes(user_id, 'budgets', budget_ids)
+        invalidate_budget_snapshots(budget_ids, min(t.date for t in transactions))
+
+def data_version(user_id):
+    """Id of the user's latest change log entry; moves whenever any of their data changes"""
+    return db.session.query(func.max(ChangeLog.id)).filter(ChangeLog.user_id == user_id).scalar() or 0
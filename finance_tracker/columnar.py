@@ -0,0 +1,290 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from .changes import data_version
+from .extensions import db
+from .models import ChangeLog, Transaction
+from .sharding import get_router
+from .utils import import_numpy
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_micros(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+class UserColumns:
+    """One user's transactions as parallel NumPy arrays, with dictionary-encoded categories"""
+
+    def __init__(self, cursor=0):
+        np = import_numpy()
+        self.size = 0
+        self.cursor = cursor  # last change log id applied
+        self.pending = set()  # ids appended by write routes, skipped once when their log entry arrives
+        self.group_codes = {}
+        self.category_codes = {}
+        self.lock = threading.Lock()
+        self._arrays = {
+            'ids': np.empty(0, np.int64),
+            'timestamps': np.empty(0, np.int64),  # microseconds since the epoch
+            'amounts': np.empty(0, np.float64),
+            'is_income': np.empty(0, np.bool_),
+            'groups': np.empty(0, np.int32),
+            'categories': np.empty(0, np.int32)
+        }
+
+    def column(self, name):
+        return self._arrays[name][:self.size]
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._arrays.values())
+
+    def append(self, rows):
+        """Append (id, date, amount, category_type, category_group, category) rows"""
+        np = import_numpy()
+        count = len(rows)
+        if not count:
+            return
+        needed = self.size + count
+        capacity = len(self._arrays['ids'])
+        if needed > capacity:
+            capacity = max(needed, capacity * 2, 64)
+            for name, array in self._arrays.items():
+                grown = np.empty(capacity, array.dtype)
+                grown[:self.size] = array[:self.size]
+                self._arrays[name] = grown
+
+        end = self.size + count
+        arrays = self._arrays
+        arrays['ids'][self.size:end] = [row[0] for row in rows]
+        arrays['timestamps'][self.size:end] = [to_micros(row[1]) for row in rows]
+        arrays['amounts'][self.size:end] = [row[2] for row in rows]
+        arrays['is_income'][self.size:end] = [row[3] == 'income' for row in rows]
+        arrays['groups'][self.size:end] = [
+            self.group_codes.setdefault(row[4], len(self.group_codes)) for row in rows
+        ]
+        arrays['categories'][self.size:end] = [
+            self.category_codes.setdefault(row[5], len(self.category_codes)) for row in rows
+        ]
+        self.size = end
+
+    def remove(self, ids):
+        np = import_numpy()
+        keep = ~np.isin(self.column('ids'), list(ids))
+        kept = int(keep.sum())
+        if kept == self.size:
+            return
+        for name, array in self._arrays.items():
+            array[:kept] = array[:self.size][keep]
+        self.size = kept
+
+    def contains(self, ids):
+        np = import_numpy()
+        return set(self.column('ids')[np.isin(self.column('ids'), list(ids))].tolist())
+
+
+ROW_COLUMNS = (
+    Transaction.id, Transaction.date, Transaction.amount,
+    Transaction.category_type, Transaction.category_group, Transaction.category
+)
+
+
+class ColumnarCache:
+    """Process-wide LRU of UserColumns bounded by a total memory budget.
+
+    Freshness comes from the change log: every read applies the entries written
+    since the columns were last synced, so writes from other workers show up too.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, user_id):
+        return (get_router().shard_for_user(user_id), user_id)
+
+    def get(self, user_id):
+        key = self._key(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if entry is None:
+            self.misses += 1
+            # Cursor first: a write racing the load is re-applied by the next catch-up
+            entry = UserColumns(cursor=data_version(user_id))
+            entry.append(db.session.query(*ROW_COLUMNS).filter(Transaction.user_id == user_id).all())
+            with self._lock:
+                self._entries[key] = entry
+        else:
+            self._catch_up(entry, user_id)
+
+        self._evict(keep=key)
+        return entry
+
+    def peek(self, user_id):
+        """Cached columns without loading or refreshing them"""
+        with self._lock:
+            return self._entries.get(self._key(user_id))
+
+    def append(self, user_id, transactions):
+        """Called by write routes: extend an already-cached user in place instead of reloading"""
+        entry = self.peek(user_id)
+        if entry is None or not transactions:
+            return
+        with entry.lock:
+            present = entry.contains([t.id for t in transactions])
+            rows = [
+                (t.id, t.date, t.amount, t.category_type, t.category_group, t.category)
+                for t in transactions if t.id not in present
+            ]
+            entry.append(rows)
+            entry.pending.update(row[0] for row in rows)
+        self._evict(keep=self._key(user_id))
+
+    def _catch_up(self, entry, user_id):
+        with entry.lock:
+            changes = db.session.query(
+                ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.action
+            ).filter(
+                ChangeLog.user_id == user_id,
+                ChangeLog.id > entry.cursor
+            ).order_by(ChangeLog.id).all()
+            if not changes:
+                return
+
+            latest = {}
+            refresh = set()
+            for _, entity, entity_id, action in changes:
+                if entity != 'transactions':
+                    continue
+                latest[entity_id] = action
+                # An appended row absorbs only its own insert entry; any later edit reloads it
+                if action == 'upsert' and entity_id in entry.pending:
+                    entry.pending.discard(entity_id)
+                else:
+                    refresh.add(entity_id)
+
+            if refresh:
+                entry.remove(refresh)
+                upserted = [i for i in refresh if latest[i] == 'upsert']
+                if upserted:
+                    entry.append(db.session.query(*ROW_COLUMNS).filter(
+                        Transaction.user_id == user_id,
+                        Transaction.id.in_(upserted)
+                    ).all())
+            entry.cursor = changes[-1].id
+
+    def _evict(self, keep):
+        with self._lock:
+            total = sum(entry.nbytes for entry in self._entries.values())
+            for key in list(self._entries):
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                total -= self._entries.pop(key).nbytes
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'users': len(self._entries),
+                'bytes': sum(entry.nbytes for entry in self._entries.values()),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+def get_cache():
+    return current_app.extensions.get('columnar_cache')
+
+def cached_columns(user_id):
+    """Up-to-date columns for the user, or None when the cache is disabled"""
+    cache = get_cache()
+    return cache.get(user_id) if cache is not None else None
+
+def append_transactions(user_id, transactions):
+    cache = get_cache()
+    if cache is not None:
+        cache.append(user_id, transactions)
+
+
+def analytics_from_columns(columns, today):
+    """Same result as the SQL path of get_analytics, computed with vectorized masks"""
+    np = import_numpy()
+    six_months_ago = today - timedelta(days=180)
+    # remove() compacts the arrays in place; the masked copies taken under the lock are a consistent snapshot
+    with columns.lock:
+        timestamps = columns.column('timestamps')
+        window = timestamps >= to_micros(six_months_ago)
+        months = timestamps[window].astype('datetime64[us]').astype('datetime64[M]')
+        amounts = columns.column('amounts')[window]
+        is_income = columns.column('is_income')[window]
+        groups = columns.column('groups')[window]
+        names = {code: name for name, code in columns.group_codes.items()}
+
+    month_keys, month_index = np.unique(months, return_inverse=True)
+    month_labels = np.datetime_as_string(month_keys, unit='M').tolist()
+    income_by_month = np.bincount(month_index, weights=np.where(is_income, amounts, 0), minlength=len(month_keys))
+    expenses_by_month = np.bincount(month_index, weights=np.where(is_income, 0, np.abs(amounts)), minlength=len(month_keys))
+
+    current_month = today.strftime('%Y-%m')
+    monthly_income = 0
+    monthly_expenses = 0
+    category_breakdown = {}
+    if current_month in month_labels:
+        current = month_index == month_labels.index(current_month)
+        monthly_income = float(amounts[current & is_income].sum())
+        expense_mask = current & ~is_income
+        monthly_expenses = abs(float(amounts[expense_mask].sum()))
+
+        expense_groups = groups[expense_mask]
+        totals = np.bincount(expense_groups, weights=np.abs(amounts[expense_mask]))
+        for code in np.unique(expense_groups).tolist():
+            category_breakdown[names[code]] = float(totals[code])
+
+    savings_rate = 0
+    if monthly_income > 0:
+        savings_rate = ((monthly_income - monthly_expenses) / monthly_income) * 100
+
+    return {
+        'summary': {
+            'income': monthly_income,
+            'expenses': monthly_expenses,
+            'savings_rate': savings_rate
+        },
+        'category_breakdown': category_breakdown,
+        'monthly_trends': {
+            label: {'income': float(income), 'expenses': float(expenses)}
+            for label, income, expenses in zip(month_labels, income_by_month, expenses_by_month)
+        }
+    }
+
+def budget_usage_from_columns(columns, category_group, category, since):
+    """Same result as Budget.get_current_usage's SQL query"""
+    with columns.lock:
+        group_code = columns.group_codes.get(category_group)
+        category_code = columns.category_codes.get(category)
+        if group_code is None or category_code is None:
+            return 0
+        mask = (
+            ~columns.column('is_income')
+            & (columns.column('groups') == group_code)
+            & (columns.column('categories') == category_code)
+            & (columns.column('timestamps') >= to_micros(since))
+        )
+        return abs(float(columns.column('amounts')[mask].sum()))
@@ -0,0 +1,5 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from .sharding import ShardedSession
+
+db = SQLAlchemy(session_options={'class_': ShardedSession})
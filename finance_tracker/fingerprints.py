@@ -0,0 +1,27 @@
+import re
+import hashlib
+from datetime import timedelta
+
+# Duplicate Detection
+def normalize_description(description):
+    """Lowercase, strip punctuation and collapse whitespace so bank export noise doesn't matter"""
+    text = re.sub(r'[^a-z0-9]+', ' ', (description or '').lower())
+    return ' '.join(text.split())
+
+def transaction_fingerprint(user_id, date, amount, description, category_type):
+    """Build the fingerprint of a transaction: user, calendar day, type, absolute amount and description"""
+    key = '|'.join([
+        str(user_id),
+        date.strftime('%Y-%m-%d'),
+        category_type or '',  # a transfer out and back on the same day is not a duplicate
+        f'{abs(float(amount)):.2f}',
+        normalize_description(description)
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def near_duplicate_fingerprints(user_id, date, amount, description, category_type, window_days=1):
+    """Fingerprints of the same transaction posted up to window_days earlier or later"""
+    return [
+        transaction_fingerprint(user_id, date + timedelta(days=offset), amount, description, category_type)
+        for offset in range(-window_days, window_days + 1) if offset != 0
+    ]
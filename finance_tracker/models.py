@@ -0,0 +1,443 @@
+import calendar
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from .extensions import db
+from .fingerprints import transaction_fingerprint
+
+STALE = 'stale'  # BudgetSnapshot.status of a closed period waiting to be recomputed
+
+# Enhanced User Model
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)  # scrypt hashes run past 160 characters
+    email = db.Column(db.String(120), unique=True, nullable=True)
+    currency = db.Column(db.String(3), default='USD')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    transactions = db.relationship('Transaction', backref='user', lazy=True)
+    budgets = db.relationship('Budget', backref='user', lazy=True)
+    savings_goals = db.relationship('SavingsGoal', backref='user', lazy=True)
+
+# Central user-to-shard map; see sharding.ShardRouter
+class UserShard(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    shard = db.Column(db.Integer, nullable=False)
+    resync_floor = db.Column(db.Integer, nullable=False, default=0)  # older sync cursors need a full snapshot
+
+# Enhanced Transaction Model
+class Transaction(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    description = db.Column(db.String(200), nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    category_type = db.Column(db.String(20), nullable=False)  # 'income' or 'expense'
+    category_group = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    savings_goal_id = db.Column(db.Integer, db.ForeignKey('savings_goal.id'), nullable=True)
+    notes = db.Column(db.Text, nullable=True)
+    is_recurring = db.Column(db.Boolean, default=False)
+    recurring_frequency = db.Column(db.String(20), nullable=True)  # 'weekly', 'monthly', 'yearly'
+    fingerprint = db.Column(db.String(40), nullable=True)  # see transaction_fingerprint()
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_transaction_user_fingerprint', 'user_id', 'fingerprint'),
+        db.Index('ix_transaction_user_date', 'user_id', 'date'),
+    )
+
+    def refresh_fingerprint(self):
+        """Recompute the duplicate-detection fingerprint from the current fields"""
+        if self.date is None:
+            # Pin the column default now so the fingerprint matches the stored date
+            self.date = datetime.utcnow()
+        self.fingerprint = transaction_fingerprint(
+            self.user_id, self.date, self.amount, self.description, self.category_type
+        )
+        return self.fingerprint
+
+    def update_savings_goal(self):
+        """Update associated savings goal if this is a contribution"""
+        if not self.savings_goal_id:
+            return
+            
+        goal = SavingsGoal.query.get(self.savings_goal_id)
+        if not goal:
+            return
+            
+        if self.category_type == 'expense':
+            # Handle withdrawal from goal
+            goal.withdraw(abs(self.amount))
+        else:
+            # Handle contribution to goal
+            goal.contribute(self.amount)
+
+# Enhanced Budget Model
+class Budget(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    category_group = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    monthly_limit = db.Column(db.Float, nullable=False)
+    alert_threshold = db.Column(db.Float, nullable=False, default=0.8)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    reset_day = db.Column(db.Integer, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    snapshots = db.relationship('BudgetSnapshot', backref='budget', lazy=True, cascade='all, delete-orphan')
+
+    def _reset_date(self, year, month):
+        """Reset day within the given month, clipped for short months"""
+        return datetime(year, month, min(self.reset_day or 1, calendar.monthrange(year, month)[1]))
+
+    def period_start(self, on=None):
+        """Start (midnight) of the budget period containing the given moment"""
+        on = on or datetime.now()
+        start = self._reset_date(on.year, on.month)
+        if on < start:
+            previous = start.replace(day=1) - timedelta(days=1)
+            start = self._reset_date(previous.year, previous.month)
+        return start
+
+    def next_period_start(self, start):
+        """Start of the period following the one beginning at start"""
+        following = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return self._reset_date(following.year, following.month)
+
+    def classify(self, percentage_used):
+        return ('danger' if percentage_used >= 100 else
+                'warning' if percentage_used >= (self.alert_threshold * 100) else
+                'good')
+
+    def close_elapsed_periods(self, since=None, attempts=3):
+        """Write snapshots for closed periods that don't have one yet, or whose figures a later
+        transaction write made stale; returns how many were written"""
+        from .changes import data_version
+        # Every transaction write logs a change in the same commit as its invalidation
+        version = data_version(self.user_id)
+        current = self.period_start()
+        if since is None:
+            last = BudgetSnapshot.query.filter_by(budget_id=self.id).order_by(
+                BudgetSnapshot.period_start.desc()
+            ).first()
+            start = (self.next_period_start(datetime.combine(last.period_start, datetime.min.time()))
+                     if last else self.period_start(self.created_at or datetime.now()))
+        else:
+            start = self.period_start(since)
+        stale = db.session.query(func.min(BudgetSnapshot.period_start)).filter(
+            BudgetSnapshot.budget_id == self.id,
+            BudgetSnapshot.status == STALE
+        ).scalar()
+        if stale is not None:
+            start = min(start, datetime.combine(stale, datetime.min.time()))
+        if start >= current:
+            return 0
+
+        starts = []
+        while start < current:
+            starts.append(start)
+            start = self.next_period_start(start)
+
+        existing = {day for (day,) in db.session.query(BudgetSnapshot.period_start).filter(
+            BudgetSnapshot.budget_id == self.id,
+            BudgetSnapshot.period_start >= starts[0].date(),
+            BudgetSnapshot.status != STALE
+        )}
+
+        # One pass over the range, bucketing each transaction into its period
+        spent = [0] * len(starts)
+        for date, amount in db.session.query(Transaction.date, Transaction.amount).filter(
+            Transaction.user_id == self.user_id,
+            Transaction.category_group == self.category_group,
+            Transaction.category == self.category,
+            Transaction.category_type == 'expense',
+            Transaction.date >= starts[0],
+            Transaction.date < current
+        ):
+            spent[bisect_right(starts, date) - 1] += abs(amount)
+
+        # Periods rebuilt after their transactions were archived count the archived rows too
+        from .archive import archived_rows, reaches_archive
+        horizon = reaches_archive(self.user_id, starts[0])
+        if horizon is not None:
+            for row in archived_rows(self.user_id, starts[0], min(horizon, current)):
+                if (row['category_type'] == 'expense' and row['category_group'] == self.category_group
+                        and row['category'] == self.category):
+                    spent[bisect_right(starts, row['date']) - 1] += abs(row['amount'])
+
+        snapshots = []
+        for index, period_start in enumerate(starts):
+            if period_start.date() in existing:
+                continue
+            period_end = starts[index + 1] if index + 1 < len(starts) else current
+            percentage_used = (spent[index] / self.monthly_limit * 100) if self.monthly_limit > 0 else 0
+            snapshots.append({
+                'budget_id': self.id,
+                'user_id': self.user_id,
+                'period_start': period_start.date(),
+                'period_end': (period_end - timedelta(days=1)).date(),
+                'monthly_limit': self.monthly_limit,
+                'spent': spent[index],
+                'percentage_used': percentage_used,
+                'status': self.classify(percentage_used)
+            })
+        if snapshots:
+            try:
+                BudgetSnapshot.query.filter(
+                    BudgetSnapshot.budget_id == self.id,
+                    BudgetSnapshot.status == STALE,
+                    BudgetSnapshot.period_start >= starts[0].date()
+                ).delete(synchronize_session=False)
+                db.session.execute(BudgetSnapshot.__table__.insert(), snapshots)
+                # Same guard as refresh_balance_checkpoints: the delete above took the write lock, so a
+                # write committed since the reads may have marked periods stale before we replaced them
+                if data_version(self.user_id) != version:
+                    db.session.rollback()
+                    return self.close_elapsed_periods(since, attempts - 1) if attempts > 1 else 0
+                db.session.commit()
+            except IntegrityError:
+                # Another request closed the same periods first
+                db.session.rollback()
+                return 0
+        return len(snapshots)
+
+    def get_current_usage(self):
+        month_start = self.period_start()
+
+        from .columnar import budget_usage_from_columns, cached_columns
+        columns = cached_columns(self.user_id)
+        if columns is not None:
+            return budget_usage_from_columns(columns, self.category_group, self.category, month_start)
+
+        # Only consider expense transactions for budget calculations
+        total_spent = db.session.query(func.sum(Transaction.amount)).filter(
+            Transaction.user_id == self.user_id,
+            Transaction.category_group == self.category_group,  # Added group check
+            Transaction.category == self.category,
+            Transaction.category_type == 'expense',  # Added type check
+            Transaction.date >= month_start
+        ).scalar() or 0
+
+        return abs(total_spent)
+
+    def get_status(self):
+        current_usage = self.get_current_usage()
+        percentage_used = (current_usage / self.monthly_limit * 100) if self.monthly_limit > 0 else 0
+        
+        return {
+            'id': self.id,
+            'category_group': self.category_group,
+            'category': self.category,
+            'monthly_limit': self.monthly_limit,
+            'current_usage': current_usage,
+            'percentage_used': percentage_used,
+            'remaining': self.monthly_limit - current_usage,
+            'alert_threshold': self.alert_threshold,
+            'status': 'danger' if percentage_used >= 100 else 
+                     'warning' if percentage_used >= (self.alert_threshold * 100) else 
+                     'good'
+        }
+
+# Closed budget periods, written when a period rolls over and rewritten when a
+# transaction in a closed period changes
+class BudgetSnapshot(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    budget_id = db.Column(db.Integer, db.ForeignKey('budget.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    monthly_limit = db.Column(db.Float, nullable=False)
+    spent = db.Column(db.Float, nullable=False)
+    percentage_used = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('budget_id', 'period_start', name='uq_budget_snapshot_period'),
+    )
+
+    def to_dict(self):
+        return {
+            'period_start': self.period_start.strftime('%Y-%m-%d'),
+            'period_end': self.period_end.strftime('%Y-%m-%d'),
+            'limit': self.monthly_limit,
+            'spent': self.spent,
+            'percentage': self.percentage_used,
+            'remaining': self.monthly_limit - self.spent,
+            'status': self.status
+        }
+
+def invalidate_budget_snapshots(budget_ids, since):
+    """Mark closed periods on or after the day of a changed transaction for recomputation.
+
+    Marked rather than deleted, so backfilled periods older than the budget are rebuilt too.
+    """
+    if not budget_ids:
+        return
+    since_day = since.date() if isinstance(since, datetime) else since
+    BudgetSnapshot.query.filter(
+        BudgetSnapshot.budget_id.in_(budget_ids),
+        BudgetSnapshot.period_end >= since_day
+    ).update({'status': STALE}, synchronize_session=False)
+
+def backfill_budget_snapshots(periods=12):
+    """Snapshot up to `periods` closed periods of history for every budget"""
+    written = 0
+    for budget in Budget.query.all():
+        since = budget.period_start()
+        for _ in range(periods):
+            since = budget.period_start(since - timedelta(days=1))
+        written += budget.close_elapsed_periods(since=since)
+    return written
+
+# Enhanced Savings Goal Model
+class SavingsGoal(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    target_amount = db.Column(db.Float, nullable=False)
+    current_amount = db.Column(db.Float, default=0)
+    target_date = db.Column(db.DateTime, nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    priority = db.Column(db.Integer, default=1)  # 1 (highest) to 5 (lowest)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def get_progress(self):
+        """Calculate progress percentage"""
+        if self.target_amount <= 0:
+            return 0
+        return min((self.current_amount / self.target_amount) * 100, 100)
+
+    def add_contribution(self, amount):
+        """Add a contribution to the goal"""
+        if amount <= 0:
+            raise ValueError("Contribution amount must be positive")
+        self.current_amount = min(self.current_amount + amount, self.target_amount)
+        db.session.commit()
+
+    def contribute(self, amount):
+        """Add a contribution to the goal with validation"""
+        if amount <= 0:
+            raise ValueError("Contribution amount must be positive")
+            
+        self.current_amount = min(self.current_amount + amount, self.target_amount)
+        db.session.commit()
+        return self.current_amount >= self.target_amount
+        
+    def withdraw(self, amount):
+        """Withdraw from the goal with validation"""
+        if amount <= 0:
+            raise ValueError("Withdrawal amount must be positive")
+            
+        self.current_amount = max(self.current_amount - amount, 0)
+        db.session.commit()
+        
+    def get_status(self):
+        """Get enhanced goal status information"""
+        progress = self.get_progress()
+        remaining = max(self.target_amount - self.current_amount, 0)
+        days_left = (self.target_date - datetime.now()).days
+        
+        monthly_needed = remaining / max(days_left / 30, 1) if days_left > 0 else 0
+        
+        status = {
+            'completed': progress >= 100,
+            'on_track': False,
+            'at_risk': False,
+            'behind': False
+        }
+        
+        # Calculate if goal is on track
+        if not status['completed']:
+            if days_left <= 0:
+                status['behind'] = True
+            else:
+                expected_progress = ((datetime.now() - self.created_at).days /
+                                  (self.target_date - self.created_at).days) * 100
+                variance = progress - expected_progress
+                
+                if variance >= -5:  # Within 5% of target
+                    status['on_track'] = True
+                elif variance >= -15:  # Within 15% of target
+                    status['at_risk'] = True
+                else:
+                    status['behind'] = True
+        
+        return {
+            'id': self.id,
+            'name': self.name,
+            'target_amount': self.target_amount,
+            'current_amount': self.current_amount,
+            'remaining': remaining,
+            'target_date': self.target_date.strftime('%Y-%m-%d'),
+            'days_left': max(days_left, 0),
+            'progress': progress,
+            'monthly_needed': monthly_needed,
+            'category': self.category,
+            'priority': self.priority,
+            'status': status,
+            'created_at': self.created_at.strftime('%Y-%m-%d')
+        }
+
+
+
+# Running Balance Checkpoints
+class BalanceCheckpoint(db.Model):
+    """End-of-day running balance (income minus expenses) for each day a user has activity"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    balance = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', name='uq_balance_checkpoint_user_day'),
+    )
+
+# Append-only per-user change feed; the row id doubles as the sync cursor
+class ChangeLog(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    entity = db.Column(db.String(20), nullable=False)  # 'transactions', 'budgets' or 'savings_goals'
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)  # 'upsert' or 'delete'
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_change_log_user_cursor', 'user_id', 'id'),
+    )
+
+# Cold storage: transactions older than the horizon live in per-user/per-year Parquet
+# files (see archive.py); these tables keep what queries need without opening them
+class ArchiveState(db.Model):
+    """Rows dated before archived_before may have been moved to the user's archive files"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, unique=True)
+    archived_before = db.Column(db.DateTime, nullable=False)
+    archived_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ArchiveSummary(db.Model):
+    """Monthly aggregates of archived transactions, by every report dimension"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    month = db.Column(db.Date, nullable=False)  # first day of the month
+    category_type = db.Column(db.String(20), nullable=False)
+    category_group = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    is_recurring = db.Column(db.Boolean, nullable=False, default=False)
+    count = db.Column(db.Integer, nullable=False)
+    total = db.Column(db.Float, nullable=False)
+    minimum = db.Column(db.Float, nullable=False)
+    maximum = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            'user_id', 'month', 'category_type', 'category_group', 'category', 'is_recurring',
+            name='uq_archive_summary_group'
+        ),
+    )
@@ -0,0 +1,143 @@
+import time
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .extensions import db
+from .models import User
+
+
+class HashingBusy(Exception):
+    """No hashing slot freed up, or the hash didn't finish, within PASSWORD_HASH_TIMEOUT seconds"""
+
+
+class PasswordHasher:
+    """Password hashing with configurable cost, run in a bounded pool of worker processes.
+
+    With PASSWORD_HASH_WORKERS = 0 hashing runs inline on the request thread.
+    """
+
+    def __init__(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.salt_length = app.config['PASSWORD_SALT_LENGTH']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        # At most a few queued jobs per worker; beyond that callers wait, then get HashingBusy
+        self._slots = threading.BoundedSemaphore(max(1, self.workers) * 4)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._current_method = None
+
+    def pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn: forking a threaded server process is not safe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._pool
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HashingBusy()
+        try:
+            future = self.pool().submit(fn, *args)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeout:
+                # Drop it if it hasn't started; a running hash finishes in the worker and is discarded
+                future.cancel()
+                raise HashingBusy()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True when the hash was made with a different method or cost than configured"""
+        if self._current_method is None:
+            # Let werkzeug fill in the default cost parameters, e.g. 'scrypt' -> 'scrypt:32768:8:1'
+            self._current_method = self.hash('').split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._current_method
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class LoginCache:
+    """Small per-process LRU of username -> (id, username, password_hash) for the login path"""
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._entries[username]
+                return None
+            self._entries.move_to_end(username)
+            return entry[0]
+
+    def put(self, username, user):
+        with self._lock:
+            self._entries[username] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def forget(self, username):
+        with self._lock:
+            self._entries.pop(username, None)
+
+
+def get_hasher():
+    return current_app.extensions['password_hasher']
+
+def find_login(username):
+    """(id, username, password_hash) for a username, served from the login cache when possible"""
+    cache = current_app.extensions['login_cache']
+    user = cache.get(username)
+    if user is None:
+        user = db.session.query(User.id, User.username, User.password_hash).filter(
+            User.username == username
+        ).first()
+        if user is None:
+            return None
+        user = tuple(user)
+        cache.put(username, user)
+    return user
+
+def authenticate(username, password):
+    """User id when the password matches, upgrading the stored hash if the configured cost changed"""
+    user = find_login(username)
+    hasher = get_hasher()
+    if user is None or not hasher.verify(user[2], password):
+        return None
+
+    user_id, username, pwhash = user
+    if hasher.needs_rehash(pwhash):
+        pwhash = hasher.hash(password)
+        db.session.query(User).filter(User.id == user_id).update({'password_hash': pwhash})
+        db.session.commit()
+        current_app.extensions['login_cache'].put(username, (user_id, username, pwhash))
+    return user_id
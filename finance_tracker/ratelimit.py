@@ -0,0 +1,153 @@
+import math
+import time
+import threading
+from collections import Counter, OrderedDict
+
+from flask import current_app, g, jsonify, request, session
+
+# Route class -> (tokens refilled per second, bucket size)
+DEFAULT_RATE_LIMITS = {
+    'default': (20, 100),
+    'auth': (1, 10),
+    'heavy': (0.5, 5),
+    'bulk': (0.1, 3)
+}
+
+# Route class -> requests allowed in flight at once in this process
+DEFAULT_CONCURRENCY_LIMITS = {
+    'heavy': 4,
+    'bulk': 2
+}
+
+
+class LocalBackend:
+    """In-process limiter state, so each worker enforces its own limits.
+
+    A shared backend (for limits across workers) needs the same three methods:
+    take(key, rate, burst) -> seconds to wait (0 when allowed),
+    acquire(key, limit) -> bool, and release(key).
+    """
+
+    def __init__(self, clock=time.monotonic, max_keys=50000):
+        self.clock = clock
+        self.max_keys = max_keys
+        # key -> (tokens, updated, time the bucket is full again), least recently used first
+        self._buckets = OrderedDict()
+        self._in_flight = Counter()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst):
+        with self._lock:
+            now = self.clock()
+            tokens, updated, _ = self._buckets.get(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._sweep(now)
+            return 0 if allowed else (1 - tokens) / rate
+
+    def _sweep(self, now):
+        """Forget buckets that have refilled (a missing bucket starts full, so nothing changes),
+        then the least recently used ones, leaving headroom so sweeps stay rare"""
+        for key in [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]:
+            del self._buckets[key]
+        while len(self._buckets) > self.max_keys * 9 // 10:
+            self._buckets.popitem(last=False)
+
+    def acquire(self, key, limit):
+        with self._lock:
+            if self._in_flight[key] >= limit:
+                return False
+            self._in_flight[key] += 1
+            return True
+
+    def release(self, key):
+        with self._lock:
+            self._in_flight[key] -= 1
+
+    def in_flight(self):
+        with self._lock:
+            return {key: count for key, count in self._in_flight.items() if count}
+
+
+def rate_limited(route_class):
+    """Put a view in a route class other than 'default'"""
+    def decorator(f):
+        f.rate_class = route_class
+        return f
+    return decorator
+
+
+class RateLimiter:
+    """Token bucket per (user, route class) plus a concurrency cap per heavy route class.
+
+    Checked before every request; the concurrency slot is released on teardown.
+    Anonymous requests are keyed by client address.
+    """
+
+    def __init__(self, app, backend=None):
+        self.backend = backend or LocalBackend(max_keys=app.config['RATELIMIT_MAX_KEYS'])
+        self.rates = dict(DEFAULT_RATE_LIMITS, **app.config.get('RATE_LIMITS', {}))
+        self.concurrency = dict(DEFAULT_CONCURRENCY_LIMITS, **app.config.get('CONCURRENCY_LIMITS', {}))
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        app.before_request(self.check)
+        app.teardown_request(self.release)
+
+    def count(self, route_class, outcome):
+        with self._lock:
+            self.counters[(route_class, outcome)] += 1
+
+    def check(self):
+        if not current_app.config.get('RATELIMIT_ENABLED', True) or request.endpoint in (None, 'static'):
+            return None
+
+        view = current_app.view_functions.get(request.endpoint)
+        route_class = getattr(view, 'rate_class', 'default')
+        client = session.get('user_id') or request.remote_addr
+
+        rate, burst = self.rates[route_class]
+        wait = self.backend.take(f'{route_class}:{client}', rate, burst)
+        if wait:
+            self.count(route_class, 'limited')
+            return self.too_many('Rate limit exceeded', wait)
+
+        limit = self.concurrency.get(route_class)
+        if limit is not None:
+            if not self.backend.acquire(route_class, limit):
+                self.count(route_class, 'busy')
+                return self.too_many('Server busy, try again shortly', 1)
+            g.rate_slot = route_class
+
+        self.count(route_class, 'allowed')
+        return None
+
+    def release(self, exc=None):
+        route_class = g.pop('rate_slot', None)
+        if route_class is not None:
+            self.backend.release(route_class)
+
+    @staticmethod
+    def too_many(message, wait):
+        retry_after = max(1, math.ceil(wait))
+        response = jsonify({'error': message, 'retry_after': retry_after})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_after)
+        return response
+
+    def stats(self):
+        with self._lock:
+            counters = {}
+            for (route_class, outcome), value in self.counters.items():
+                counters.setdefault(route_class, {})[outcome] = value
+        in_flight = self.backend.in_flight() if hasattr(self.backend, 'in_flight') else {}
+        return {
+            'counters': counters,
+            'in_flight': in_flight,
+            'rate_limits': {name: {'rate': rate, 'burst': burst} for name, (rate, burst) in self.rates.items()},
+            'concurrency_limits': self.concurrency
+        }
@@ -0,0 +1,222 @@
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import cast, func, select, Integer
+
+from .archive import archived_rows, reaches_archive
+from .changes import data_version
+from .extensions import db
+from .models import ArchiveSummary, Transaction
+from .sharding import get_router
+
+# Period labels computed by SQLite, so grouping happens in the same query
+PERIODS = {
+    'day': lambda column: func.strftime('%Y-%m-%d', column),
+    'week': lambda column: func.strftime('%Y-W%W', column),
+    'month': lambda column: func.strftime('%Y-%m', column),
+    'quarter': lambda column: func.strftime('%Y', column) + '-Q' + cast(
+        (cast(func.strftime('%m', column), Integer) + 2) // 3, db.String
+    ),
+    'year': lambda column: func.strftime('%Y', column)
+}
+
+# The same labels in Python, for archived rows read from files
+PERIOD_LABELS = {
+    'day': lambda moment: moment.strftime('%Y-%m-%d'),
+    'week': lambda moment: moment.strftime('%Y-W%W'),
+    'month': lambda moment: moment.strftime('%Y-%m'),
+    'quarter': lambda moment: f'{moment.year}-Q{(moment.month + 2) // 3}',
+    'year': lambda moment: moment.strftime('%Y')
+}
+
+DIMENSIONS = {
+    'category_type': Transaction.category_type,
+    'category_group': Transaction.category_group,
+    'category': Transaction.category,
+    'is_recurring': Transaction.is_recurring
+}
+
+def _merge_key(key):
+    return tuple((value is None, value) for value in key)
+
+MEASURES = {
+    'sum': func.sum,
+    'count': func.count,
+    'avg': func.avg,
+    'min': func.min,
+    'max': func.max
+}
+
+
+class ReportSpec:
+    """A validated report request; `key` is its canonical form for caching"""
+
+    def __init__(self, dimensions, measures, period='month', start=None, end=None, category_type=None):
+        unknown = [d for d in dimensions if d != 'period' and d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension: {', '.join(unknown)}")
+        unknown = [m for m in measures if m not in MEASURES]
+        if unknown:
+            raise ValueError(f"Unknown measure: {', '.join(unknown)}")
+        if not measures:
+            raise ValueError('At least one measure is required')
+        if period not in PERIODS:
+            raise ValueError(f"Invalid period (expected {', '.join(PERIODS)})")
+
+        self.dimensions = list(dict.fromkeys(dimensions))
+        self.measures = list(dict.fromkeys(measures))
+        self.period = period
+        self.start = start
+        self.end = end
+        self.category_type = category_type
+
+    @property
+    def key(self):
+        return (
+            tuple(self.dimensions), tuple(self.measures), self.period,
+            self.start.isoformat() if self.start else None,
+            self.end.isoformat() if self.end else None,
+            self.category_type
+        )
+
+    def compile(self, user_id):
+        """One grouped SELECT over the user's transactions"""
+        groups = [
+            PERIODS[self.period](Transaction.date).label('period') if name == 'period' else DIMENSIONS[name].label(name)
+            for name in self.dimensions
+        ]
+        measures = [MEASURES[name](Transaction.amount).label(name) for name in self.measures]
+
+        criteria = [Transaction.user_id == user_id]
+        if self.start is not None:
+            criteria.append(Transaction.date >= self.start)
+        if self.end is not None:
+            criteria.append(Transaction.date < self.end)
+        if self.category_type is not None:
+            criteria.append(Transaction.category_type == self.category_type)
+
+        query = select(*groups, *measures).where(*criteria)
+        if groups:
+            query = query.group_by(*groups).order_by(*groups)
+        return query
+
+    def _groups(self, model, date_column):
+        return [
+            PERIODS[self.period](date_column) if name == 'period' else getattr(model, name)
+            for name in self.dimensions
+        ]
+
+    def hot_partials(self, user_id):
+        """(dimension values, count, total, min, max) per group of the live table"""
+        groups = self._groups(Transaction, Transaction.date)
+        criteria = [Transaction.user_id == user_id]
+        if self.start is not None:
+            criteria.append(Transaction.date >= self.start)
+        if self.end is not None:
+            criteria.append(Transaction.date < self.end)
+        if self.category_type is not None:
+            criteria.append(Transaction.category_type == self.category_type)
+        query = select(
+            *groups, func.count(Transaction.amount), func.sum(Transaction.amount),
+            func.min(Transaction.amount), func.max(Transaction.amount)
+        ).where(*criteria)
+        if groups:
+            query = query.group_by(*groups)
+        return db.session.execute(query).all()
+
+    def summary_covers(self, horizon):
+        """Monthly summaries answer the archived part when no month is cut by the range or period"""
+        whole_month = lambda moment: moment.day == 1 and moment.time() == datetime.min.time()
+        return (
+            ('period' not in self.dimensions or self.period in ('month', 'quarter', 'year'))
+            and (self.start is None or whole_month(self.start))
+            and (self.end is None or self.end >= horizon or whole_month(self.end))
+        )
+
+    def summary_partials(self, user_id):
+        groups = self._groups(ArchiveSummary, ArchiveSummary.month)
+        criteria = [ArchiveSummary.user_id == user_id]
+        if self.start is not None:
+            criteria.append(ArchiveSummary.month >= self.start.date())
+        if self.end is not None:
+            criteria.append(ArchiveSummary.month < self.end.date())
+        if self.category_type is not None:
+            criteria.append(ArchiveSummary.category_type == self.category_type)
+        query = select(
+            *groups, func.sum(ArchiveSummary.count), func.sum(ArchiveSummary.total),
+            func.min(ArchiveSummary.minimum), func.max(ArchiveSummary.maximum)
+        ).where(*criteria)
+        if groups:
+            query = query.group_by(*groups)
+        return db.session.execute(query).all()
+
+    def archived_partials(self, user_id):
+        """Partials grouped in Python from the archive files, for day/week periods or ranges cutting a month"""
+        groups = {}
+        for row in archived_rows(user_id, self.start, self.end):
+            if self.category_type is not None and row['category_type'] != self.category_type:
+                continue
+            key = tuple(
+                PERIOD_LABELS[self.period](row['date']) if name == 'period' else row[name]
+                for name in self.dimensions
+            )
+            amount = row['amount']
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [1, amount, amount, amount]
+            else:
+                group[0] += 1
+                group[1] += amount
+                group[2] = min(group[2], amount)
+                group[3] = max(group[3], amount)
+        return [(*key, *values) for key, values in groups.items()]
+
+    def merge(self, *parts):
+        """Combine partials from several sources and derive the requested measures"""
+        width = len(self.dimensions)
+        groups = {}
+        for part in parts:
+            for row in part:
+                key, (count, total, low, high) = tuple(row[:width]), row[width:]
+                if not count:
+                    groups.setdefault(key, [0, None, None, None])
+                    continue
+                group = groups.get(key)
+                if group is None or not group[0]:
+                    groups[key] = [count, total, low, high]
+                else:
+                    group[0] += count
+                    group[1] += total
+                    group[2] = min(group[2], low)
+                    group[3] = max(group[3], high)
+
+        rows = []
+        for key in sorted(groups, key=_merge_key):
+            count, total, low, high = groups[key]
+            values = {
+                'sum': total, 'count': count, 'avg': total / count if count else None,
+                'min': low, 'max': high
+            }
+            rows.append(dict(zip(self.dimensions, key), **{name: values[name] for name in self.measures}))
+        return rows
+
+
+def run_report(user_id, spec):
+    """Report rows for the spec, computed once per version of the user's data; returns (rows, cached)"""
+    cache = current_app.extensions['report_cache']
+    key = (get_router().shard_for_user(user_id), user_id, spec.key)
+    version = data_version(user_id)
+
+    rows = cache.get(key, version)
+    if rows is not None:
+        return rows, True
+
+    horizon = reaches_archive(user_id, spec.start)
+    if horizon is None:
+        names = spec.dimensions + spec.measures
+        rows = [dict(zip(names, row)) for row in db.session.execute(spec.compile(user_id))]
+    else:
+        archived = spec.summary_partials(user_id) if spec.summary_covers(horizon) else spec.archived_partials(user_id)
+        rows = spec.merge(spec.hot_partials(user_id), archived)
+    cache.put(key, version, rows)
+    return rows, False
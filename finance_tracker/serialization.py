@@ -0,0 +1,80 @@
+import json
+
+from flask import Response
+from sqlalchemy import func, select
+
+from .extensions import db
+from .models import Budget, Transaction
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+# Serialization
+# One column spec per resource: (output key, SQL expression). Dates are formatted by
+# SQLite in the same query, so list endpoints never hydrate ORM instances or call strftime.
+def _day(column):
+    return func.strftime('%Y-%m-%d', column)
+
+TRANSACTION_FIELDS = [
+    ('id', Transaction.id),
+    ('date', _day(Transaction.date)),
+    ('description', Transaction.description),
+    ('amount', Transaction.amount),
+    ('category_type', Transaction.category_type),
+    ('category_group', Transaction.category_group),
+    ('category', Transaction.category),
+    ('notes', Transaction.notes),
+    ('is_recurring', Transaction.is_recurring),
+    ('recurring_frequency', Transaction.recurring_frequency)
+]
+
+GOAL_TRANSACTION_FIELDS = [
+    ('id', Transaction.id),
+    ('date', _day(Transaction.date)),
+    ('description', Transaction.description),
+    ('amount', Transaction.amount),
+    ('category_type', Transaction.category_type)
+]
+
+# Exports keep the stored timestamp text, matching the CSV files users already have
+EXPORT_FIELDS = {
+    'transactions': (Transaction, [
+        ('date', db.cast(Transaction.date, db.String)),
+        ('description', Transaction.description),
+        ('amount', Transaction.amount),
+        ('category_type', Transaction.category_type),
+        ('category_group', Transaction.category_group),
+        ('category', Transaction.category),
+        ('notes', Transaction.notes)
+    ]),
+    'budgets': (Budget, [
+        ('category_group', Budget.category_group),
+        ('category', Budget.category),
+        ('monthly_limit', Budget.monthly_limit),
+        ('alert_threshold', Budget.alert_threshold),
+        ('reset_day', Budget.reset_day)
+    ])
+}
+
+def fetch_rows(fields, *criteria, order_by=None):
+    """Select only the spec's columns and return plain Core rows"""
+    query = select(*[column.label(name) for name, column in fields]).where(*criteria)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    return db.session.execute(query).all()
+
+def serialize_rows(fields, rows):
+    """Turn Core rows into dicts keyed by the spec's output names"""
+    keys = [name for name, _ in fields]
+    return [dict(zip(keys, row)) for row in rows]
+
+def dumps(payload, indent=False):
+    """Encode to JSON bytes with orjson when available; much cheaper than jsonify for large lists"""
+    if orjson:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(payload, indent=2 if indent else None).encode('utf-8')
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
@@ -0,0 +1,226 @@
+import os
+import zlib
+import threading
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.util import find_tables
+
+# Account tables stay in the central database; everything else lives on the user's shard
+CENTRAL_TABLES = {'user', 'user_shard'}
+
+
+def _set_wal(dbapi_connection, connection_record):
+    dbapi_connection.execute('PRAGMA journal_mode=WAL')
+
+def enable_wal(engine):
+    """Put a file-backed SQLite engine in WAL mode, where readers (and online backups) don't block writers"""
+    if engine.url.get_backend_name() == 'sqlite' and engine.url.database not in (None, '', ':memory:'):
+        sa.event.listen(engine, 'connect', _set_wal)
+
+
+class ShardRouter:
+    """Maps users to one of SHARD_COUNT databases and caches an engine per shard.
+
+    Shard 0 is always the central database, so with SHARD_COUNT = 1 (the default)
+    an unsharded deployment behaves exactly as before; shards 1..N-1 are their own
+    SQLite files.
+    """
+
+    def __init__(self, app, db):
+        self.db = db
+        self.count = app.config.get('SHARD_COUNT', 1)
+        self.wal = app.config.get('SQLITE_WAL', False)
+        self.url_template = app.config.get('SHARD_URI_TEMPLATE') or (
+            'sqlite:///' + os.path.join(app.instance_path, 'finance_tracker_shard_{shard}.db')
+        )
+        if self.count > 1:
+            os.makedirs(app.instance_path, exist_ok=True)
+        self._engines = {}
+        self._assignments = {}
+        self._lock = threading.Lock()
+
+    @property
+    def central(self):
+        return self.db.engine
+
+    def sharded_tables(self):
+        return [table for table in self.db.metadata.sorted_tables if table.name not in CENTRAL_TABLES]
+
+    def engine(self, shard):
+        """Cached engine for a shard, creating the shard's tables the first time it is opened"""
+        if shard == 0:
+            return self.central
+        engine = self._engines.get(shard)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(shard)
+                if engine is None:
+                    engine = sa.create_engine(
+                        self.url_template.format(shard=shard),
+                        connect_args={'timeout': 30}
+                    )
+                    if self.wal:
+                        enable_wal(engine)
+                    self.db.metadata.create_all(engine, tables=self.sharded_tables())
+                    self._engines[shard] = engine
+        return engine
+
+    def default_shard(self, user_id, count=None):
+        """Hash placement used when a user has no entry in the shard map yet"""
+        return zlib.crc32(str(user_id).encode('utf-8')) % (count or self.count)
+
+    def assignment(self, user_id):
+        """(shard, resync_floor) for a user, assigning and persisting a shard on first use"""
+        cached = self._assignments.get(user_id)
+        if cached is not None:
+            return cached
+
+        from .models import UserShard
+        table = UserShard.__table__
+        with self.central.begin() as conn:
+            row = conn.execute(
+                sa.select(table.c.shard, table.c.resync_floor).where(table.c.user_id == user_id)
+            ).first()
+            if row is None:
+                shard = self.default_shard(user_id)
+                conn.execute(table.insert().values(user_id=user_id, shard=shard, resync_floor=0))
+                row = (shard, 0)
+        self._assignments[user_id] = tuple(row)
+        return self._assignments[user_id]
+
+    def shard_for_user(self, user_id):
+        return self.assignment(user_id)[0]
+
+    def forget(self, user_id=None):
+        """Drop cached assignments after the shard map was changed by a migration"""
+        if user_id is None:
+            self._assignments.clear()
+        else:
+            self._assignments.pop(user_id, None)
+
+    def current_shard(self):
+        if 'shard' in g:
+            return g.shard
+        if has_request_context() and 'user_id' in session:
+            return self.shard_for_user(session['user_id'])
+        if self.count == 1:
+            return 0
+        raise RuntimeError('No shard selected; wrap the code in use_shard() or for_each_shard()')
+
+
+class ShardedSession(Session):
+    """Session that sends sharded tables to the current user's shard engine"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+
+        router = current_app.extensions.get('shard_router')
+        if router is not None:
+            if mapper is not None:
+                tables = [sa.inspect(mapper).local_table]
+            elif clause is not None:
+                tables = find_tables(clause, include_crud=True)
+            else:
+                tables = []
+            if any(table.name not in CENTRAL_TABLES for table in tables):
+                return router.engine(router.current_shard())
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def get_router():
+    return current_app.extensions['shard_router']
+
+@contextmanager
+def use_shard(shard):
+    """Route sharded tables to the given shard, for jobs running outside a user request"""
+    db = get_router().db
+    previous = g.pop('shard', None)
+    # Identity maps are per shard: row ids repeat across shards
+    db.session.close()
+    g.shard = shard
+    try:
+        yield
+        db.session.commit()
+    finally:
+        db.session.close()
+        g.pop('shard', None)
+        if previous is not None:
+            g.shard = previous
+
+def for_each_shard():
+    """Yield every shard number with the session routed to it"""
+    for shard in range(get_router().count):
+        with use_shard(shard):
+            yield shard
+
+
+# Rebalancing: copy order and the foreign keys that must follow renumbered rows.
+# The change log is not copied; clients holding an old cursor are sent a full snapshot.
+MIGRATION_PLAN = [
+    ('savings_goal', {}),
+    ('budget', {}),
+    ('transaction', {'savings_goal_id': 'savings_goal'}),
+    ('budget_snapshot', {'budget_id': 'budget'}),
+    ('balance_checkpoint', {}),
+    ('archive_state', {}),
+    ('archive_summary', {})
+]
+
+def migrate_user(user_id, target_shard):
+    """Move all of a user's rows to another shard and repoint the shard map; returns rows moved"""
+    router = get_router()
+    source_shard, _ = router.assignment(user_id)
+    if source_shard == target_shard:
+        return 0
+
+    tables = {table.name: table for table in router.sharded_tables()}
+    source = router.engine(source_shard)
+    target = router.engine(target_shard)
+    change_log = tables['change_log']
+    moved = 0
+
+    with source.connect() as src, target.begin() as dst:
+        id_maps = {}
+        for name, remap in MIGRATION_PLAN:
+            table = tables[name]
+            id_maps[name] = {}
+            for row in src.execute(sa.select(table).where(table.c.user_id == user_id).order_by(table.c.id)):
+                values = dict(row._mapping)
+                old_id = values.pop('id')
+                for column, parent in remap.items():
+                    if values.get(column) is not None:
+                        values[column] = id_maps[parent].get(values[column])
+                new_id = dst.execute(table.insert().values(**values)).inserted_primary_key[0]
+                id_maps[name][old_id] = new_id
+                moved += 1
+
+        # Put a marker above every cursor either shard could have handed out
+        floor = 1 + max(
+            src.execute(sa.select(sa.func.max(change_log.c.id))).scalar() or 0,
+            dst.execute(sa.select(sa.func.max(change_log.c.id))).scalar() or 0
+        )
+        dst.execute(change_log.insert().values(
+            id=floor, user_id=user_id, entity='migration', entity_id=source_shard, action='upsert'
+        ))
+
+    from .models import UserShard
+    with router.central.begin() as conn:
+        conn.execute(UserShard.__table__.update().where(
+            UserShard.__table__.c.user_id == user_id
+        ).values(shard=target_shard, resync_floor=floor))
+    router.forget(user_id)
+
+    # Archive files are keyed by user and stay put, but their ids must follow the renumbering
+    from .archive import remap_archive
+    remap_archive(user_id, id_maps['transaction'], id_maps['savings_goal'])
+
+    with source.begin() as src:
+        for name, _ in reversed(MIGRATION_PLAN + [('change_log', {})]):
+            src.execute(tables[name].delete().where(tables[name].c.user_id == user_id))
+
+    return moved
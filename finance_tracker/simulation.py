@@ -0,0 +1,176 @@
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from .archive import archived_before, months_ago
+from .changes import data_version
+from .extensions import db
+from .models import SavingsGoal, Transaction
+from .sharding import get_router
+from .utils import import_numpy
+
+QUANTILES = {'p10': 10, 'p50': 50, 'p90': 90}
+
+
+def month_index(moment):
+    return moment.year * 12 + moment.month - 1
+
+def month_label(index):
+    return f'{index // 12}-{index % 12 + 1:02d}'
+
+
+def monthly_history(user_id, goal_ids, now=None):
+    """Unlinked net cash flow and per-goal contributions for each complete month of the history window.
+
+    Returns (months, net, contributions) with net[m] and contributions[g][m]. Archived months
+    are left out: their summaries don't keep the goal a transaction was linked to.
+    """
+    now = now or datetime.now()
+    start = months_ago(current_app.config['SIMULATION_HISTORY_MONTHS'], now)
+    end = months_ago(0, now)  # the current month is incomplete
+    horizon = archived_before(user_id)
+    if horizon is not None:
+        start = max(start, horizon)
+
+    month = func.strftime('%Y-%m', Transaction.date)
+    # Same direction as Transaction.update_savings_goal: a linked income is paid into the
+    # goal, a linked expense is taken out of it
+    signed = db.case(
+        (Transaction.category_type == 'income', Transaction.amount),
+        else_=-func.abs(Transaction.amount)
+    )
+    # Links to goals that no longer exist count as ordinary cash flow
+    goal = db.case(
+        (Transaction.savings_goal_id.in_(goal_ids), Transaction.savings_goal_id),
+        else_=None
+    ) if goal_ids else db.null()
+    rows = db.session.execute(
+        select(goal, month, func.sum(signed)).where(
+            Transaction.user_id == user_id, Transaction.date >= start, Transaction.date < end
+        ).group_by(goal, month)
+    ).all()
+
+    if not rows:
+        return [], [], {}
+    first = min(month_index(datetime.strptime(label, '%Y-%m')) for _, label, _ in rows)
+    months = [month_label(index) for index in range(first, month_index(end))]
+    position = {label: i for i, label in enumerate(months)}
+
+    net = [0.0] * len(months)
+    contributions = {goal_id: [0.0] * len(months) for goal_id in goal_ids}
+    for goal_id, label, total in rows:
+        (net if goal_id is None else contributions[goal_id])[position[label]] = total
+    return months, net, contributions
+
+
+def simulate(goals, net, contributions, paths, seed, now=None):
+    """Monte Carlo completion of every goal at once, resampling whole historical months.
+
+    Each path draws a sequence of past months; in a drawn month a goal receives the
+    contributions that were linked to it then, plus a priority-weighted share of the
+    month's surplus (positive net cash flow of the transactions not linked to a goal). Drawing the same month for all goals keeps
+    them correlated with each other and with the user's cash flow. Monthly resolution.
+    """
+    np = import_numpy()
+    now = now or datetime.now()
+    current = month_index(now)
+
+    results = {}
+    active = []
+    for goal in goals:
+        remaining = max(goal.target_amount - goal.current_amount, 0)
+        results[goal.id] = {
+            'id': goal.id,
+            'name': goal.name,
+            'remaining': remaining,
+            'target_date': goal.target_date.strftime('%Y-%m-%d')
+        }
+        if remaining <= 0:
+            results[goal.id].update({
+                'probability': 1.0, 'never': 0.0,
+                'completion': {name: month_label(current) for name in QUANTILES},
+                'distribution': {month_label(current): paths}
+            })
+        else:
+            active.append(goal)
+
+    if active and not net:
+        for goal in active:
+            results[goal.id].update({'probability': None, 'never': None, 'completion': None, 'distribution': {}})
+        active = []
+    if not active:
+        return [results[goal.id] for goal in goals], 0
+
+    target_steps = np.array([month_index(goal.target_date) - current for goal in active])
+    horizon = int(min(max(2 * (target_steps.max() + 1), 12), current_app.config['SIMULATION_MAX_MONTHS']))
+
+    weights = np.array([1 / (goal.priority or 1) for goal in active], dtype=np.float32)
+    weights /= weights.sum()
+    surplus = np.maximum(np.asarray(net, dtype=np.float32), 0)
+    # (goals, history months): what each goal would receive if that month repeated
+    per_month = np.asarray([contributions[goal.id] for goal in active], dtype=np.float32) + weights[:, None] * surplus
+    remaining = np.array([results[goal.id]['remaining'] for goal in active], dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    # counts[g, k]: paths completing goal g at step k (end of the k-th month from now); k = horizon is never
+    counts = np.zeros((len(active), horizon + 1), dtype=np.int64)
+    offsets = np.arange(len(active))[:, None] * (horizon + 1)
+    # Paths run in chunks so memory stays bounded however many goals and paths are asked for
+    chunk = max(1, current_app.config['SIMULATION_MAX_CELLS'] // (len(active) * horizon))
+    for offset in range(0, paths, chunk):
+        draws = rng.integers(0, len(net), size=(min(chunk, paths - offset), horizon))
+        saved = np.take(per_month, draws, axis=1)  # (goals, paths, horizon); much faster than fancy indexing
+        np.cumsum(saved, axis=2, out=saved)
+        reached = saved >= remaining[:, None, None]
+        first = reached.argmax(axis=2)
+        # argmax is 0 both for "reached in the first month" and "never reached"
+        done = np.take_along_axis(reached, first[:, :, None], axis=2)[:, :, 0]
+        steps = np.where(done, first, horizon)
+        counts += np.bincount((steps + offsets).ravel(), minlength=counts.size).reshape(counts.shape)
+
+    for i, goal in enumerate(active):
+        cumulative = np.cumsum(counts[i])
+        completion = None
+        if counts[i, :horizon].any():
+            # Same as np.percentile(steps, q, method='lower') over the individual paths
+            positions = [int(q / 100 * (paths - 1)) for q in QUANTILES.values()]
+            values = np.searchsorted(cumulative, positions, side='right')
+            completion = {
+                name: month_label(current + int(value)) if value < horizon else None
+                for name, value in zip(QUANTILES, values)
+            }
+        on_time = int(cumulative[min(target_steps[i], horizon - 1)]) if target_steps[i] >= 0 else 0
+        results[goal.id].update({
+            'probability': on_time / paths,
+            'never': int(counts[i, horizon]) / paths,
+            'completion': completion,
+            'distribution': {month_label(current + k): int(n) for k, n in enumerate(counts[i, :horizon].tolist()) if n}
+        })
+    return [results[goal.id] for goal in goals], horizon
+
+
+def simulate_goals(user_id, paths, seed):
+    """Completion odds for all of the user's goals, recomputed once per version of their data;
+    returns (result, cached)"""
+    cache = current_app.extensions['simulation_cache']
+    # The month is part of the key: the same data simulates from a different start next month
+    key = (get_router().shard_for_user(user_id), user_id, paths, seed, month_index(datetime.now()))
+    version = data_version(user_id)
+
+    result = cache.get(key, version)
+    if result is not None:
+        return result, True
+
+    goals = SavingsGoal.query.filter_by(user_id=user_id).order_by(SavingsGoal.id).all()
+    months, net, contributions = monthly_history(user_id, [goal.id for goal in goals])
+    simulated, horizon = simulate(goals, net, contributions, paths, seed)
+    result = {
+        'goals': simulated,
+        'paths': paths,
+        'seed': seed,
+        'history_months': len(months),
+        'horizon_months': horizon
+    }
+    cache.put(key, version, result)
+    return result, False
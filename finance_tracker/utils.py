@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+
+from flask import jsonify
+
+from .extensions import db
+
+def import_numpy():
+    # Imported on first use so workers that never need it (no columnar cache, no simulations) don't pay for numpy
+    import numpy
+    return numpy
+
+# Error Handler Decorator
+def handle_errors(f):
+    def wrapped(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+    wrapped.__name__ = f.__name__
+    return wrapped
+
+
+class VersionedCache:
+    """Per-process LRU of computed results keyed by (shard, user, ...), tagged with the data version.
+
+    Used for report rows and goal simulations.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, result):
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
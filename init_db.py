@@ -1,5 +1,31 @@
-from app import app, db
+from sqlalchemy import inspect, text
+
+from finance_tracker import create_app
+from finance_tracker.extensions import db
+
+app = create_app()
 
 with app.app_context():
     db.create_all()
+
+    # create_all() never alters existing tables, so add columns introduced later by hand
+    columns = {column['name'] for column in inspect(db.engine).get_columns('transaction')}
+    with db.engine.begin() as conn:
+        if 'fingerprint' not in columns:
+            conn.execute(text('ALTER TABLE "transaction" ADD COLUMN fingerprint VARCHAR(40)'))
+            print("Added transaction fingerprint column")
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_transaction_user_fingerprint '
+            'ON "transaction" (user_id, fingerprint)'
+        ))
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_transaction_user_date '
+            'ON "transaction" (user_id, date)'
+        ))
+
+    # Shard 0 is the central database; the others get their tables when first opened
+    router = app.extensions['shard_router']
+    for shard in range(1, router.count):
+        router.engine(shard)
+
     print("Database tables created successfully!")
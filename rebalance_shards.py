@@ -0,0 +1,50 @@
+"""Move users between shards.
+
+    python rebalance_shards.py --shards N [--dry-run]   re-home every user for an N-shard layout
+    python rebalance_shards.py --user ID --to SHARD      move one (e.g. heavy) user
+
+Run it with workers stopped, then start them with SHARD_COUNT=N; running workers
+cache the user-to-shard map.
+"""
+import argparse
+
+from finance_tracker import create_app
+from finance_tracker.extensions import db
+from finance_tracker.models import User
+from finance_tracker.sharding import get_router, migrate_user
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--shards', type=int, help='target shard count')
+parser.add_argument('--user', type=int, help='move a single user')
+parser.add_argument('--to', type=int, help='destination shard for --user')
+parser.add_argument('--dry-run', action='store_true')
+args = parser.parse_args()
+
+if args.user is None and not args.shards:
+    parser.error('pass --shards N or --user ID --to SHARD')
+if args.user is not None and args.to is None:
+    parser.error('--user needs --to')
+
+app = create_app()
+
+with app.app_context():
+    router = get_router()
+    if args.user is not None:
+        moves = [(args.user, args.to)]
+    else:
+        user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+        moves = [(user_id, router.default_shard(user_id, args.shards)) for user_id in user_ids]
+
+    moved_users = 0
+    for user_id, target in moves:
+        current = router.shard_for_user(user_id)
+        if current == target:
+            continue
+        if args.dry_run:
+            print(f"user {user_id}: shard {current} -> {target}")
+        else:
+            rows = migrate_user(user_id, target)
+            print(f"user {user_id}: shard {current} -> {target} ({rows} rows)")
+        moved_users += 1
+
+    print(f"{'Would move' if args.dry_run else 'Moved'} {moved_users} of {len(moves)} users")
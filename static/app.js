@@ -132,6 +132,8 @@ function initializeSidebar() {
 // =============== 4. State and DOM Elements ===============
 const state = {
     transactions: [],
+    goals: [],
+    syncCursor: null,
     filters: {
         category: '',
         dateFrom: '',
@@ -241,22 +243,23 @@ document.head.appendChild(style);
 // Data Loading Functions
 async function loadDashboardData() {
     try {
-        const [transactionsRes, analyticsRes, goalsRes] = await Promise.allSettled([
-            fetch('/api/transactions'),
-            fetch('/api/analytics'),
-            fetch('/api/savings-goals')
+        const [syncRes, analyticsRes] = await Promise.allSettled([
+            fetch('/api/sync'),
+            fetch('/api/analytics')
         ]);
 
         // Handle individual request failures
         const results = {
-            transactions: transactionsRes.status === 'fulfilled' ? await transactionsRes.value.json() : null,
-            analytics: analyticsRes.status === 'fulfilled' ? await analyticsRes.value.json() : null,
-            goals: goalsRes.status === 'fulfilled' ? await goalsRes.value.json() : null
+            sync: syncRes.status === 'fulfilled' ? await syncRes.value.json() : null,
+            analytics: analyticsRes.status === 'fulfilled' ? await analyticsRes.value.json() : null
         };
 
-        if (results.transactions) {
-            state.transactions = results.transactions;
-            updateTransactions(results.transactions);
+        if (results.sync) {
+            state.transactions = results.sync.transactions;
+            state.goals = results.sync.savings_goals;
+            state.syncCursor = results.sync.cursor;
+            updateTransactions(state.transactions);
+            updateGoals(state.goals);
         }
 
         if (results.analytics) {
@@ -264,10 +267,6 @@ async function loadDashboardData() {
             updateCharts(results.analytics);
         }
 
-        if (results.goals) {
-            updateGoals(results.goals);
-        }
-
         await loadBudgets();
 
     } catch (error) {
@@ -293,6 +292,54 @@ async function loadDashboardWithRetry(retries = 3, delay = 1000) {
     showNotification('Failed to load dashboard data after multiple retries.', 'error');
 }
 
+// Replace changed rows in a local list and drop deleted ones
+function mergeById(items, changed, deletedIds) {
+    const byId = new Map(items.map(item => [item.id, item]));
+    deletedIds.forEach(id => byId.delete(id));
+    changed.forEach(item => byId.set(item.id, item));
+    return Array.from(byId.values());
+}
+
+// Pull only the rows changed since the last sync instead of reloading every list
+async function syncDashboardData() {
+    if (state.syncCursor === null) {
+        return loadDashboardData();
+    }
+
+    try {
+        let hasMore = true;
+        while (hasMore) {
+            const response = await fetch(`/api/sync?since=${state.syncCursor}`);
+            if (!response.ok) throw new Error('Failed to sync changes');
+
+            const changes = await response.json();
+            // A full snapshot (e.g. after the account moved shards) replaces the local copy
+            const transactions = changes.full ? [] : state.transactions;
+            const goals = changes.full ? [] : state.goals;
+            state.transactions = mergeById(transactions, changes.transactions, changes.deleted.transactions)
+                .sort((a, b) => b.date.localeCompare(a.date) || b.id - a.id);
+            state.goals = mergeById(goals, changes.savings_goals, changes.deleted.savings_goals);
+            state.syncCursor = changes.cursor;
+            hasMore = changes.has_more;
+        }
+
+        updateTransactions(state.transactions);
+        updateGoals(state.goals);
+
+        const analyticsRes = await fetch('/api/analytics');
+        if (analyticsRes.ok) {
+            const analytics = await analyticsRes.json();
+            updateMetrics(analytics.summary);
+            updateCharts(analytics);
+        }
+
+        await loadBudgets(state.budgets.currentPage);
+    } catch (error) {
+        console.error('Sync error:', error);
+        await loadDashboardData();
+    }
+}
+
 // Add new function to load budgets
 async function loadBudgets(page = 1) {
     try {
@@ -588,7 +635,7 @@ async function deleteBudget(budgetId) {
         }
         
         showNotification('Budget deleted successfully');
-        loadDashboardData();
+        syncDashboardData();
     } catch (error) {
         console.error('Error deleting budget:', error);
         showNotification('Failed to delete budget', 'error');
@@ -1127,7 +1174,7 @@ async function handleTransactionFormSubmit(e) {
         closeModal('transaction-modal');
         form.reset();
         delete form.dataset.goalId;
-        await loadDashboardData();
+        await syncDashboardData();
         
     } catch (error) {
         showNotification(error.message, 'error');
@@ -1150,7 +1197,7 @@ async function handleBudgetFormSubmit(e) {
             showNotification('Budget updated successfully');
             form.closest('.modal').classList.add('hidden');
             form.reset();
-            await loadDashboardData();
+            await syncDashboardData();
         } else {
             const errorData = await response.json();
             throw new Error(errorData.message || 'Failed to update budget');
@@ -1176,7 +1223,7 @@ async function handleGoalFormSubmit(e) {
             showNotification('Goal added successfully');
             form.closest('.modal').classList.add('hidden');
             form.reset();
-            await loadDashboardData();
+            await syncDashboardData();
         } else {
             const errorData = await response.json();
             throw new Error(errorData.message || 'Failed to add goal');
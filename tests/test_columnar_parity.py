@@ -0,0 +1,152 @@
+"""The columnar cache must answer analytics and budget usage exactly like the SQL path.
+
+Amounts are multiples of 0.25 so every sum is exact whatever order it is taken in,
+which lets the two paths be compared with == instead of a tolerance.
+"""
+import io
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from finance_tracker.extensions import db
+from finance_tracker.models import Budget, Transaction
+
+CATEGORIES = [
+    ('income', 'Regular Income', 'Salary/Wages'),
+    ('income', 'Passive Income', 'Investments'),
+    ('expense', 'Living Expenses', 'Groceries'),
+    ('expense', 'Living Expenses', 'Healthcare'),
+    ('expense', 'Lifestyle', 'Shopping'),
+    ('expense', 'Lifestyle', 'Dining Out')
+]
+CSV_HEADER = 'date,description,amount,category_type,category_group,category,notes\n'
+
+
+def amount(rng):
+    return rng.randint(4, 2000) / 4
+
+def seed(user_id, rows=300):
+    rng = random.Random(0)
+    now = datetime.now()
+    transactions = []
+    for i in range(rows):
+        category_type, group, category = rng.choice(CATEGORIES)
+        value = amount(rng)
+        transactions.append({
+            'date': now - timedelta(minutes=rng.randint(0, 60 * 24 * 240)),
+            'description': f'Transaction {i}',
+            # Old rows stored expenses as negative amounts; both signs must come out the same
+            'amount': value if category_type == 'income' or i % 2 else -value,
+            'category_type': category_type,
+            'category_group': group,
+            'category': category,
+            'notes': '',
+            'is_recurring': False,
+            'user_id': user_id
+        })
+    db.session.execute(Transaction.__table__.insert(), transactions)
+    db.session.add_all([
+        Budget(user_id=user_id, category_group='Lifestyle', category='Shopping', monthly_limit=1000),
+        Budget(user_id=user_id, category_group='Living Expenses', category='Groceries', monthly_limit=800)
+    ])
+    db.session.commit()
+
+def both_paths(app, client):
+    cache = app.extensions.pop('columnar_cache')
+    try:
+        sql = client.get('/api/analytics').get_json()
+        sql_usage = [b['spent'] for b in client.get('/api/budget-status').get_json()['budgets']]
+    finally:
+        app.extensions['columnar_cache'] = cache
+    cached = client.get('/api/analytics').get_json()
+    cached_usage = [b['spent'] for b in client.get('/api/budget-status').get_json()['budgets']]
+    for payload in (sql, cached):
+        payload.pop('last_updated')
+    return sql, cached, sql_usage, cached_usage
+
+def assert_parity(app, client):
+    sql, cached, sql_usage, cached_usage = both_paths(app, client)
+    assert cached == sql
+    assert cached_usage == sql_usage
+
+def ids(client, description):
+    return [t['id'] for t in client.get('/api/transactions').get_json() if t['description'] == description]
+
+
+@pytest.fixture
+def seeded(app, client, user_id):
+    seed(user_id)
+    return app, client
+
+
+def test_load(seeded, user_id):
+    app, client = seeded
+    assert_parity(app, client)
+    assert app.extensions['columnar_cache'].peek(user_id) is not None
+
+def test_post(seeded):
+    app, client = seeded
+    assert_parity(app, client)
+    for category_type, group, category in CATEGORIES:
+        response = client.post('/api/transactions', json={
+            'description': f'New {category}', 'amount': 37.75, 'category_type': category_type,
+            'category_group': group, 'category': category
+        })
+        assert response.status_code == 200
+    assert_parity(app, client)
+
+def test_put(seeded):
+    app, client = seeded
+    client.post('/api/transactions', json={
+        'description': 'Edited', 'amount': 120.5, 'category_type': 'expense',
+        'category_group': 'Lifestyle', 'category': 'Shopping'
+    })
+    assert_parity(app, client)
+
+    transaction_id, = ids(client, 'Edited')
+    # Moves the amount between both budgets and the category breakdown
+    response = client.put('/api/transactions', json={
+        'id': transaction_id, 'amount': 64.25, 'category_group': 'Living Expenses', 'category': 'Groceries'
+    })
+    assert response.status_code == 200
+    assert_parity(app, client)
+
+    response = client.put('/api/transactions', json={
+        'id': transaction_id, 'category_type': 'income', 'category_group': 'Regular Income', 'category': 'Salary/Wages'
+    })
+    assert response.status_code == 200
+    assert_parity(app, client)
+
+def test_delete(seeded):
+    app, client = seeded
+    client.post('/api/transactions', json={
+        'description': 'Deleted', 'amount': 250, 'category_type': 'expense',
+        'category_group': 'Lifestyle', 'category': 'Shopping'
+    })
+    assert_parity(app, client)
+
+    doomed = ids(client, 'Deleted') + ids(client, 'Transaction 7')
+    assert len(doomed) == 2
+    for transaction_id in doomed:
+        assert client.delete(f'/api/transactions?id={transaction_id}').status_code == 200
+    assert_parity(app, client)
+
+def test_import(seeded):
+    app, client = seeded
+    assert_parity(app, client)
+
+    rng = random.Random(1)
+    now = datetime.now()
+    lines = []
+    for i in range(40):
+        category_type, group, category = rng.choice(CATEGORIES)
+        day = now - timedelta(days=rng.randint(0, 200), minutes=rng.randint(0, 1440))
+        lines.append(f"{day.strftime('%Y-%m-%d %H:%M:%S')},Imported {i},{amount(rng)},{category_type},{group},{category},")
+    response = client.post('/api/import', data={
+        'file': (io.BytesIO((CSV_HEADER + '\n'.join(lines)).encode()), 'import.csv')
+    })
+    assert response.get_json()['imported'] == 40
+    assert_parity(app, client)
@@ -0,0 +1,41 @@
+import io
+
+from finance_tracker.models import Transaction
+
+CSV_HEADER = 'date,description,amount,category_type,category_group,category,notes\n'
+
+
+def post_csv(client, lines):
+    return client.post('/api/import', data={
+        'file': (io.BytesIO((CSV_HEADER + '\n'.join(lines)).encode()), 'import.csv')
+    })
+
+
+def test_bad_amount_lines_are_reported_and_the_rest_imported(client, user_id):
+    response = post_csv(client, [
+        '2025-03-01 10:00:00,Groceries,42.5,expense,Living Expenses,Groceries,',
+        '2025-03-02 10:00:00,Not a number,nan,expense,Living Expenses,Groceries,',
+        '2025-03-03 10:00:00,Infinite,inf,expense,Living Expenses,Groceries,',
+        '2025-03-04 10:00:00,Zero,0,expense,Living Expenses,Groceries,',
+        '2025-03-05 10:00:00,Refund?,-100,income,Regular Income,Salary/Wages,',
+        '2025-03-06 10:00:00,Text,abc,expense,Living Expenses,Groceries,',
+        # Older exports store expenses as negative amounts
+        '2025-03-07 10:00:00,Legacy expense,-12.25,expense,Living Expenses,Groceries,',
+    ])
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['imported'] == 2
+    assert [error['line'] for error in body['errors']] == [3, 4, 5, 6, 7]
+    assert sorted(t.description for t in Transaction.query.filter_by(user_id=user_id)) == ['Groceries', 'Legacy expense']
+
+
+def test_missing_columns_are_reported_per_line(client, user_id):
+    response = client.post('/api/import', data={
+        'file': (io.BytesIO(b'date,description,amount\n2025-03-01 10:00:00,Groceries,42.5\n'), 'import.csv')
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['imported'] == 0
+    assert body['errors'] == [{'line': 2, 'error': 'Missing column: category_type'}]
@@ -0,0 +1,45 @@
+from finance_tracker.ratelimit import LocalBackend
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_map_stays_bounded_under_many_clients():
+    clock = Clock()
+    backend = LocalBackend(clock=clock, max_keys=100)
+    for client in range(10000):
+        backend.take(f'auth:10.0.{client // 256}.{client % 256}', 1, 10)
+        clock.now += 0.001
+    assert len(backend._buckets) <= 100
+
+
+def test_refilled_buckets_are_dropped_before_recently_used_ones():
+    clock = Clock()
+    backend = LocalBackend(clock=clock, max_keys=10)
+    backend.take('auth:idle', 1, 10)
+    clock.now = 100  # long enough for 'auth:idle' to refill
+    for client in range(8):
+        backend.take(f'auth:{client}', 1, 10)
+    for _ in range(10):
+        backend.take('auth:busy', 1, 10)
+    backend.take('auth:new', 1, 10)
+
+    assert 'auth:idle' not in backend._buckets
+    assert 'auth:0' not in backend._buckets  # least recently used, dropped for headroom
+    # The drained bucket survived the sweep, so its limit still holds
+    assert backend.take('auth:busy', 1, 10) == 1
+
+
+def test_dropping_a_full_bucket_does_not_change_the_limit():
+    clock = Clock()
+    backend = LocalBackend(clock=clock, max_keys=1)
+    assert [backend.take('heavy:1', 0.5, 5) for _ in range(6)][-1] == 2
+    clock.now = 10  # refilled
+    backend.take('heavy:2', 0.5, 5)
+    assert 'heavy:1' not in backend._buckets
+    assert [backend.take('heavy:1', 0.5, 5) for _ in range(6)] == [0, 0, 0, 0, 0, 2]